@@ -0,0 +1,53 @@
+"""
+Shared background event loop for synchronous callers (Streamlit scripts, blocking wrappers)
+
+Coroutines submitted from any thread run on one long-lived loop, so their agent
+calls overlap and loop-bound state (pooled MCP sessions, HTTP clients) survives
+between calls.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Optional
+
+# uvloop is optional - fall back to the default asyncio loop when unavailable
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+_bg_loop_instance: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _bg_loop() -> asyncio.AbstractEventLoop:
+    """Start the long-lived event loop (uvloop when installed) on a daemon thread on first use"""
+    global _bg_loop_instance
+    with _bg_loop_lock:
+        if _bg_loop_instance is None:
+            loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mcp-event-loop", daemon=True).start()
+            _bg_loop_instance = loop
+    return _bg_loop_instance
+
+
+def submit_async(coro) -> concurrent.futures.Future:
+    """Schedule a coroutine on the background event loop without waiting for it"""
+    return asyncio.run_coroutine_threadsafe(coro, _bg_loop())
+
+
+def run_async(coro):
+    """Run a coroutine on the background event loop and block until it completes"""
+    return submit_async(coro).result()
+
+
+async def run_eager(coro):
+    """
+    Await a coroutine with the eager task factory installed (Python 3.12+)
+
+    Tasks that finish without blocking then skip the event loop queue.
+    """
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    return await coro
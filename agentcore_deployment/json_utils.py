@@ -0,0 +1,38 @@
+"""
+JSON helpers shared by the UIs and test scripts, kept free of AWS dependencies
+"""
+import json
+from typing import Any, Dict, Union
+
+# orjson is optional - fall back to the stdlib json module when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to JSON bytes, with orjson when it is installed
+
+    OPT_NON_STR_KEYS lets orjson accept int dict keys, as the stdlib module does,
+    so a report that serializes with one backend also serializes with the other.
+    """
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def dumps_report(data: Dict[str, Any]) -> bytes:
+    """Serialize a downloadable report to indented JSON bytes"""
+    return dumps_json(data, indent=True)
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text or bytes, with orjson when it is installed
+
+    Raises json.JSONDecodeError (orjson's error subclasses it) on invalid input.
+    """
+    return orjson.loads(data) if orjson else json.loads(data)
@@ -3,19 +3,32 @@
 Ultra-minimal MCP server for LangGraph agent - debugging version
 """
 
+import base64
+
 from mcp.server.fastmcp import FastMCP
 
 # Create the simplest possible MCP server
 mcp = FastMCP(host="0.0.0.0", stateless_http=True)
 
+def read_s3_image_base64(s3_uri: str) -> str:
+    """Download an s3:// image with the agent's IAM role and return it base64 encoded"""
+    import boto3
+    bucket, _, key = s3_uri[len("s3://"):].partition("/")
+    body = boto3.client("s3").get_object(Bucket=bucket, Key=key)["Body"].read()
+    return base64.b64encode(body).decode("ascii")
+
 @mcp.tool()
-def analyze_kitchen(prompt: str = "test", image_data: str = None, image_path: str = None):
+def analyze_kitchen(prompt: str = "test", image_data: str = None, image_path: str = None, image_s3_uri: str = None):
     """Ultra simple kitchen analysis - debugging"""
+    # UI clients upload the image to S3 and send its URI instead of the bytes
+    if image_s3_uri and not image_data:
+        image_data = read_s3_image_base64(image_s3_uri)
     return {
         "status": "success",
         "detected_objects": [{"name": "refrigerator", "confidence": 0.85}],
         "materials": [{"material_type": "granite", "area_sqm": 15.0}],
-        "analysis": "Test kitchen analysis via minimal MCP server"
+        "analysis": "Test kitchen analysis via minimal MCP server",
+        "image_received": bool(image_data)
     }
 
 if __name__ == "__main__":
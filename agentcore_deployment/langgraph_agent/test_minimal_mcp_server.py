@@ -0,0 +1,40 @@
+"""
+Check that the image arguments UI clients send reach the minimal LangGraph MCP tool
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+import minimal_mcp_server
+
+
+def call_analyze_kitchen(**arguments):
+    """Call analyze_kitchen through the MCP server, so argument validation applies"""
+    result = asyncio.run(minimal_mcp_server.mcp.call_tool("analyze_kitchen", arguments))
+    # Depending on the SDK version call_tool returns content blocks, or (content, structured)
+    content = result[0] if isinstance(result, tuple) else result
+    return json.loads(content[0].text)
+
+
+def test_image_s3_uri_reaches_tool(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(minimal_mcp_server, "read_s3_image_base64",
+                        lambda uri: fetched.append(uri) or "aW1hZ2U=")
+    
+    result = call_analyze_kitchen(prompt="Analyze kitchen", image_s3_uri="s3://bucket/kitchen-images/1.jpg")
+    
+    assert fetched == ["s3://bucket/kitchen-images/1.jpg"]
+    assert result["image_received"] is True
+
+
+def test_image_data_takes_precedence(monkeypatch):
+    monkeypatch.setattr(minimal_mcp_server, "read_s3_image_base64",
+                        lambda uri: pytest.fail("image_data was given, S3 should not be read"))
+    
+    result = call_analyze_kitchen(image_data="aW1hZ2U=", image_s3_uri="s3://bucket/1.jpg")
+    
+    assert result["image_received"] is True
@@ -6,6 +6,9 @@ Handles Cognito JWT token generation and management.
 import boto3
 import json
 import logging
+import os
+import time
+from pathlib import Path
 from typing import Dict, Any, Optional
 from botocore.exceptions import ClientError
 
@@ -303,6 +306,45 @@ def get_bearer_token_for_agent(agent_name: str, region: str = "us-west-2") -> st
             return ""
 
 
+
+# Bearer tokens are cached on disk between runs and reused for this long after they are
+# fetched - Cognito access tokens and the STS fallback token both last an hour
+TOKEN_CACHE_SECONDS = 3300
+# Per-user directory (mode 0700) rather than the shared temp dir, since the files hold credentials
+TOKEN_CACHE_DIR = Path.home() / ".cache" / "agentcore_mcp"
+
+
+def get_bearer_token_for_agent_cached(agent_name: str, region: str = "us-west-2") -> str:
+    """
+    Get a bearer token for an agent, reusing one cached on disk by an earlier run when still valid
+    
+    Args:
+        agent_name: Name of the agent
+        region: AWS region
+        
+    Returns:
+        Valid bearer token (empty string if none could be obtained)
+    """
+    cache_path = TOKEN_CACHE_DIR / f"{agent_name}_{region}.json"
+    try:
+        cached = json.loads(cache_path.read_text())
+        # Leave a minute of headroom so a token doesn't expire mid-request
+        if cached["expires_at"] > time.time() + 60:
+            return cached["token"]
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    token = get_bearer_token_for_agent(agent_name, region)
+    if token:
+        try:
+            TOKEN_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"token": token, "expires_at": time.time() + TOKEN_CACHE_SECONDS}, f)
+        except OSError as e:
+            logger.warning(f"Could not cache bearer token for {agent_name}: {e}")
+    return token
+
 # Example usage:
 """
 # Setup authentication for all agents
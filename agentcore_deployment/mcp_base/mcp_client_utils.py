@@ -7,7 +7,10 @@ import asyncio
 import boto3
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, List, Optional
 from datetime import timedelta
 from boto3.session import Session
 
@@ -17,14 +20,61 @@ from mcp.client.streamable_http import streamablehttp_client
 logger = logging.getLogger(__name__)
 
 
+def create_http_session(pool_maxsize: int = 32) -> requests.Session:
+    """
+    Create a keep-alive HTTP session for MCP tool invocations
+    
+    Args:
+        pool_maxsize: Maximum number of pooled connections per host
+        
+    Returns:
+        requests.Session with a sized connection pool mounted for HTTPS
+    """
+    http_session = requests.Session()
+    http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize))
+    return http_session
+
+
+# Side-effect-free tools whose successful results are reused for a short while
+CACHEABLE_TOOLS = frozenset({"health_check", "tools/list"})
+CACHEABLE_TOOL_TTL = 30
+
+
 class AgentCoreMCPClient:
     """MCP client for invoking other AgentCore agents using Model Context Protocol"""
     
-    def __init__(self, region: str = "us-west-2", timeout: int = 120):
+    def __init__(self, region: str = "us-west-2", timeout: int = 120, http_session: Optional[requests.Session] = None,
+                 token_provider: Optional[Callable[[str], str]] = None):
         self.region = region
         self.timeout = timeout
         self.session = Session()
         self._cached_credentials = {}
+        # Optional callable returning a bearer token per agent name (JWT-authorized runtimes);
+        # without one, requests are signed with SigV4
+        self.token_provider = token_provider
+        # Shared connection pool so TLS sessions are reused across tool calls and agents
+        self.http_session = http_session or create_http_session()
+        # Resolved once and reused for SigV4 signing; botocore refreshes them when they expire
+        self._signing_credentials = None
+        # (agent_name, tool_name, arguments) -> (expires_at, result) for CACHEABLE_TOOLS
+        self._tool_cache = {}
+    
+    def close(self):
+        """Close the underlying HTTP connection pool"""
+        self.http_session.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _get_signing_credentials(self):
+        """Return the AWS credentials used to SigV4-sign MCP requests"""
+        if self._signing_credentials is None:
+            from botocore.session import Session as BotoSession
+            self._signing_credentials = BotoSession().get_credentials()
+        return self._signing_credentials
         
     async def get_agent_credentials(self, agent_name: str) -> Dict[str, str]:
         """
@@ -74,6 +124,8 @@ class AgentCoreMCPClient:
         """
         Invoke a specific tool on another agent via MCP using direct HTTP with correct headers
         
+        Successful results of CACHEABLE_TOOLS are reused for CACHEABLE_TOOL_TTL seconds.
+        
         Args:
             agent_name: Name of the target agent
             tool_name: Name of the tool to invoke
@@ -82,6 +134,21 @@ class AgentCoreMCPClient:
         Returns:
             Tool execution result
         """
+        if tool_name not in CACHEABLE_TOOLS:
+            return await self._call_agent_tool(agent_name, tool_name, **kwargs)
+        
+        cache_key = (agent_name, tool_name, json.dumps(kwargs, sort_keys=True, default=str))
+        cached = self._tool_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        result = await self._call_agent_tool(agent_name, tool_name, **kwargs)
+        if result.get("status") == "success":
+            self._tool_cache[cache_key] = (time.monotonic() + CACHEABLE_TOOL_TTL, result)
+        return result
+    
+    async def _call_agent_tool(self, agent_name: str, tool_name: str, **kwargs) -> Dict[str, Any]:
+        """Send a tools/call request to an agent, bypassing the result cache"""
         try:
             logger.info(f"🔄 Invoking {tool_name} on {agent_name} via MCP (Fixed Headers)...")
             
@@ -105,10 +172,8 @@ class AgentCoreMCPClient:
             }
             
             # KEY FIX: Use requests with AWS SigV4 + correct MCP headers
-            import requests
             from botocore.auth import SigV4Auth
             from botocore.awsrequest import AWSRequest
-            from botocore.session import Session as BotoSession
             
             # Create AWS request with correct headers
             headers = {
@@ -116,6 +181,11 @@ class AgentCoreMCPClient:
                 "Accept": "application/json, text/event-stream"  # MCP requirement: both types
             }
             
+            # The provider may do a blocking token fetch on a cache miss, so keep it off the loop
+            bearer_token = await asyncio.to_thread(self.token_provider, agent_name) if self.token_provider else ""
+            if bearer_token:
+                headers["authorization"] = f"Bearer {bearer_token}"
+            
             # Prepare request
             request = AWSRequest(
                 method='POST',
@@ -124,14 +194,14 @@ class AgentCoreMCPClient:
                 headers=headers
             )
             
-            # Sign with SigV4
-            boto_session = BotoSession()
-            credentials = boto_session.get_credentials()
-            SigV4Auth(credentials, 'bedrock-agentcore', self.region).add_auth(request)
+            # Sign with SigV4 unless the runtime is JWT-authorized
+            if not bearer_token:
+                SigV4Auth(self._get_signing_credentials(), 'bedrock-agentcore', self.region).add_auth(request)
             
-            # Make signed request
+            # Make signed request off the event loop so concurrent tool calls overlap
             prepped = request.prepare()
-            response = requests.post(
+            response = await asyncio.to_thread(
+                self.http_session.post,
                 prepped.url,
                 headers=dict(prepped.headers),
                 data=prepped.body,
@@ -191,18 +261,27 @@ class AgentCoreMCPClient:
         Returns:
             List of available tools with their descriptions
         """
+        cache_key = (agent_name, "tools/list", "")
+        cached = self._tool_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
             logger.info(f"🔍 Listing tools for {agent_name} via MCP...")
             
             credentials = await self.get_agent_credentials(agent_name)
             agent_arn = credentials['agent_arn']
             bearer_token = credentials['bearer_token']
+            if self.token_provider:
+                bearer_token = await asyncio.to_thread(self.token_provider, agent_name)
             
             encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
             mcp_url = f"https://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
             
             headers = {"Content-Type": "application/json"}
-            # Skip authorization header - using no-auth deployment mode
+            # Skip authorization header unless a token is available - using no-auth deployment mode
+            if bearer_token:
+                headers["authorization"] = f"Bearer {bearer_token}"
             
             async with streamablehttp_client(
                 mcp_url, 
@@ -226,6 +305,7 @@ class AgentCoreMCPClient:
                         })
                     
                     logger.info(f"✅ Found {len(tools)} tools on {agent_name}")
+                    self._tool_cache[cache_key] = (time.monotonic() + CACHEABLE_TOOL_TTL, tools)
                     return tools
                     
         except Exception as e:
@@ -295,17 +375,19 @@ async def call_crewai_agent(materials_data: List[Dict], cost_grade: str = "stand
     )
 
 
-async def discover_available_agents(region: str = "us-west-2") -> Dict[str, List[Dict[str, Any]]]:
+async def discover_available_agents(region: str = "us-west-2",
+                                    client: Optional[AgentCoreMCPClient] = None) -> Dict[str, List[Dict[str, Any]]]:
     """
     Discover all available agents and their tools in the system
     
     Args:
         region: AWS region
+        client: Existing client to reuse (and its connection pool); a new one is created if omitted
         
     Returns:
         Dictionary mapping agent names to their available tools
     """
-    client = AgentCoreMCPClient(region=region)
+    client = client or AgentCoreMCPClient(region=region)
     
     # Common agent names in the system
     agent_names = ["langgraph_agent", "crewai_agent", "orchestrator_agent"]
@@ -5,8 +5,10 @@ Uses Model Context Protocol to invoke other agents
 
 import asyncio
 import boto3
+import functools
 import json
 import logging
+import time
 from typing import Dict, Any, List, Optional
 from boto3.session import Session
 from mcp import ClientSession
@@ -15,6 +17,10 @@ from mcp.client.streamable_http import streamablehttp_client
 logger = logging.getLogger(__name__)
 
 
+# Agent credentials are reused for this long; the STS fallback token is valid for an hour
+CREDENTIALS_TTL = 3000
+
+
 class MCPAgentClient:
     """MCP client for invoking AgentCore agents using Model Context Protocol"""
     
@@ -22,9 +28,15 @@ class MCPAgentClient:
         self.region = region
         self.timeout = timeout
         self.session = Session()
+        # agent_name -> (expires_at, credentials)
+        self._cached_credentials = {}
         
     async def get_agent_credentials(self, agent_name: str) -> Dict[str, str]:
-        """Retrieve agent ARN and authentication credentials"""
+        """Retrieve agent ARN and authentication credentials (cached for CREDENTIALS_TTL seconds)"""
+        cached = self._cached_credentials.get(agent_name)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
             # Get agent ARN from Parameter Store
             ssm_client = boto3.client('ssm', region_name=self.region)
@@ -47,10 +59,12 @@ class MCPAgentClient:
                 # Fall back to using AWS credentials for authentication
                 bearer_token = self._generate_temporary_token()
             
-            return {
+            credentials = {
                 'agent_arn': agent_arn,
                 'bearer_token': bearer_token
             }
+            self._cached_credentials[agent_name] = (time.monotonic() + CREDENTIALS_TTL, credentials)
+            return credentials
             
         except Exception as e:
             logger.error(f"Failed to retrieve credentials for {agent_name}: {e}")
@@ -178,10 +192,16 @@ class MCPAgentClient:
             return []
 
 
+@functools.cache
+def get_shared_client(region: str = "us-west-2") -> MCPAgentClient:
+    """Return the process-wide MCPAgentClient for a region, so credential lookups are shared"""
+    return MCPAgentClient(region)
+
+
 # Backward compatibility functions
 async def invoke_langgraph_agent_mcp(query: str, image_path: Optional[str] = None) -> Dict[str, Any]:
     """Invoke LangGraph agent via MCP for kitchen analysis"""
-    client = MCPAgentClient()
+    client = get_shared_client()
     arguments = {
         "prompt": f"Analyze kitchen for renovation planning: {query}",
         "image_path": image_path
@@ -191,7 +211,7 @@ async def invoke_langgraph_agent_mcp(query: str, image_path: Optional[str] = Non
 
 async def invoke_crewai_agent_mcp(materials_data: List[Dict], cost_grade: str = "standard") -> Dict[str, Any]:
     """Invoke CrewAI agent via MCP for cost estimation"""
-    client = MCPAgentClient()
+    client = get_shared_client()
     arguments = {
         "prompt": f"Estimate costs for kitchen renovation with {cost_grade} grade materials",
         "materials_data": materials_data,
@@ -203,7 +223,7 @@ async def invoke_crewai_agent_mcp(materials_data: List[Dict], cost_grade: str =
 # Utility function for testing
 async def test_mcp_agent_communication():
     """Test MCP communication with all agents"""
-    client = MCPAgentClient()
+    client = get_shared_client()
     
     print("🧪 Testing MCP Agent Communication")
     print("=" * 60)
@@ -89,6 +89,28 @@ def estimate_renovation_costs_with_crewai(materials_data: List[Dict], cost_grade
         return {"error": f"CrewAI cost estimation failed: {str(e)}"}
 
 
+@tool
+def analyze_and_estimate(image_path: str = None, cost_grade: str = "standard") -> Dict[str, Any]:
+    """
+    Analyze the kitchen with LangGraph and estimate costs for the detected materials with CrewAI in one step.
+    
+    Args:
+        image_path: Path to the kitchen image file (optional for AgentCore)
+        cost_grade: Cost grade - economy, standard, or premium
+        
+    Returns:
+        Dictionary with the LangGraph analysis under "analysis" and the CrewAI breakdown under "cost_estimates"
+    """
+    # Materials go straight from the LangGraph result into the CrewAI call instead of
+    # taking an extra model turn to be copied out of one tool result into the next
+    analysis = analyze_kitchen_with_langgraph(image_path)
+    if "error" in analysis:
+        return {"analysis": analysis, "cost_estimates": {"error": "Skipped - kitchen analysis failed"}}
+    
+    cost_estimates = estimate_renovation_costs_with_crewai(analysis.get("materials", []), cost_grade)
+    return {"analysis": analysis, "cost_estimates": cost_estimates}
+
+
 @tool
 def generate_renovation_recommendations(detection_results: Dict, cost_estimates: Dict) -> List[str]:
     """
@@ -145,18 +167,17 @@ orchestrator_agent = Agent(
 
 IMPORTANT: When a user asks about kitchen renovation, analysis, or cost estimates, you MUST use your tools:
 
-1. ALWAYS start by calling analyze_kitchen_with_langgraph() to get kitchen analysis data
-2. THEN call estimate_renovation_costs_with_crewai() using the materials from step 1
-3. FINALLY call generate_renovation_recommendations() to provide personalized advice
+1. ALWAYS start by calling analyze_and_estimate() to get the kitchen analysis and cost estimates together
+2. FINALLY call generate_renovation_recommendations() to provide personalized advice
 
 Your tools work with mock data and don't require actual images. They will provide realistic analysis results.
 
 Process:
-1. Call analyze_kitchen_with_langgraph() - this returns detected objects, materials, and measurements
-2. Extract the materials_data from the analysis results
-3. Call estimate_renovation_costs_with_crewai(materials_data, "standard") for cost estimates
-4. Call generate_renovation_recommendations(analysis_results, cost_results) for advice
-5. Synthesize all results into a comprehensive renovation plan
+1. Call analyze_and_estimate(image_path, cost_grade) - this returns the LangGraph analysis (detected objects, materials, measurements) under "analysis" and the CrewAI cost breakdown under "cost_estimates"
+2. Call generate_renovation_recommendations(analysis, cost_estimates) for advice
+3. Synthesize all results into a comprehensive renovation plan
+
+Only call analyze_kitchen_with_langgraph() or estimate_renovation_costs_with_crewai() on their own when the user asks for just one of them.
 
 Always provide costs in Australian dollars and measurements in square metres.
 Focus on practical, actionable advice for homeowners.
@@ -168,7 +189,7 @@ CRITICAL FORMATTING RULES:
 - Provide ONLY the final, clean, professional analysis report
 - Format your response as a well-structured renovation report with clear sections
 - Use proper markdown formatting with headers, bullet points, and cost tables""",
-    tools=[analyze_kitchen_with_langgraph, estimate_renovation_costs_with_crewai, generate_renovation_recommendations]
+    tools=[analyze_and_estimate, analyze_kitchen_with_langgraph, estimate_renovation_costs_with_crewai, generate_renovation_recommendations]
 )
 
 
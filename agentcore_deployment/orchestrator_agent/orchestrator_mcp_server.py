@@ -8,6 +8,7 @@ import os
 import json
 import logging
 import asyncio
+import base64
 from typing import Dict, Any, List
 from datetime import datetime
 
@@ -25,6 +26,16 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def read_s3_image_base64(s3_uri: str, region: str = "us-west-2") -> str:
+    """
+    Download an s3:// image with the orchestrator's IAM role and return it base64 encoded
+    """
+    import boto3
+    bucket, _, key = s3_uri[len("s3://"):].partition("/")
+    body = boto3.client("s3", region_name=region).get_object(Bucket=bucket, Key=key)["Body"].read()
+    return base64.b64encode(body).decode("ascii")
+
+
 class OrchestratorMCPServer:
     """MCP Server implementation for Orchestrator Agent with multi-agent coordination"""
     
@@ -335,7 +346,8 @@ Highlight the benefits of the MCP-based multi-agent architecture in your respons
                 return json.dumps(error_result, indent=2)
         
         @self.mcp_server.mcp.tool()
-        def orchestrate_renovation_workflow(image_data: str, renovation_goals: str = "Modern kitchen upgrade", budget_range: str = "50000-100000") -> str:
+        def orchestrate_renovation_workflow(image_data: str = None, renovation_goals: str = "Modern kitchen upgrade", budget_range: str = "50000-100000",
+                                            image_s3_uri: str = None) -> str:
             """
             Complete kitchen renovation workflow orchestrating LangGraph and CrewAI agents via MCP
             
@@ -343,6 +355,7 @@ Highlight the benefits of the MCP-based multi-agent architecture in your respons
                 image_data: Base64 encoded kitchen image
                 renovation_goals: Description of renovation goals
                 budget_range: Budget range for renovation
+                image_s3_uri: s3:// URI of the kitchen image, used when image_data is not given
                 
             Returns:
                 JSON string with complete renovation analysis and cost estimates
@@ -354,6 +367,9 @@ Highlight the benefits of the MCP-based multi-agent architecture in your respons
                 
                 # Step 1: Analyze kitchen with LangGraph agent
                 logger.info("🔍 Step 1: Kitchen Analysis via LangGraph MCP agent...")
+                # The LangGraph tools only accept image_data, so resolve an S3 reference here
+                if image_s3_uri and not image_data:
+                    image_data = read_s3_image_base64(image_s3_uri, self.region)
                 kitchen_result = asyncio.run(
                     self.mcp_client.invoke_agent_tool(
                         "langgraph_agent",
@@ -16,7 +16,9 @@ from pydantic import BaseModel
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(__file__))
-from utils import get_agent_arn_from_parameter_store, invoke_agent_with_boto3
+from utils import get_agent_arns_from_parameter_store, invoke_agent_with_boto3
+
+AGENT_NAMES = ["orchestrator_agent", "langgraph_agent", "crewai_agent"]
 
 # LLM Cost Extractor (embedded to avoid import issues)
 class ExtractedCosts(BaseModel):
@@ -135,6 +137,11 @@ Important:
 def get_cost_extractor():
     return LLMCostExtractor()
 
+# Look up all agent ARNs with one Parameter Store round trip per 5 minutes
+@st.cache_data(ttl=300)
+def get_agent_arns() -> Dict[str, str]:
+    return get_agent_arns_from_parameter_store(AGENT_NAMES)
+
 def clean_orchestrator_response(raw_response: str) -> str:
     """Clean up orchestrator response by removing artifacts - simplified version"""
     import re
@@ -265,7 +272,7 @@ with col2:
             with st.spinner("🤖 Running enhanced multi-agent analysis..."):
                 try:
                     # Get orchestrator agent ARN
-                    orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
+                    orchestrator_arn = get_agent_arns()["orchestrator_agent"]
                     
                     # Create progress tracking
                     with st.status("Running Enhanced AI Analysis...", expanded=True) as status:
@@ -390,7 +397,7 @@ with col2:
                     with st.expander("🔧 Debug Information"):
                         st.text(f"Error details: {str(e)}")
                         try:
-                            orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
+                            orchestrator_arn = get_agent_arns()["orchestrator_agent"]
                             st.text(f"Orchestrator ARN: {orchestrator_arn}")
                         except Exception as debug_e:
                             st.text(f"Could not get orchestrator ARN: {debug_e}")
@@ -452,25 +459,19 @@ with col2:
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🤖 Agent Status")
 
-# Check orchestrator status
-try:
-    orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
-    st.sidebar.success("✅ Orchestrator Agent: Ready")
-except Exception as e:
-    st.sidebar.error("❌ Orchestrator Agent: Not available")
-
-# Check sub-agents status
-try:
-    langgraph_arn = get_agent_arn_from_parameter_store("langgraph_agent")
-    st.sidebar.success("✅ LangGraph Agent: Ready")
-except:
-    st.sidebar.error("❌ LangGraph Agent: Not available")
-
+# Check agent status with a single batched lookup
 try:
-    crewai_arn = get_agent_arn_from_parameter_store("crewai_agent")
-    st.sidebar.success("✅ CrewAI Agent: Ready")
-except:
-    st.sidebar.error("❌ CrewAI Agent: Not available")
+    agent_arns = get_agent_arns()
+except Exception:
+    agent_arns = {}
+
+for agent_name, label in [("orchestrator_agent", "Orchestrator Agent"),
+                          ("langgraph_agent", "LangGraph Agent"),
+                          ("crewai_agent", "CrewAI Agent")]:
+    if agent_name in agent_arns:
+        st.sidebar.success(f"✅ {label}: Ready")
+    else:
+        st.sidebar.error(f"❌ {label}: Not available")
 
 # LLM Cost Extractor status
 try:
@@ -8,22 +8,97 @@ import json
 import os
 import sys
 import asyncio
+import atexit
+import base64
+import functools
 import logging
-from PIL import Image
+import queue
+import shutil
+import string
 import tempfile
-from typing import Dict, Any, List
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+from collections import Counter
 from datetime import datetime
+from pathlib import Path
 
-# Add mcp_base to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'mcp_base'))
+from async_loop import submit_async
+from json_utils import dumps_report
 
-from mcp_base.mcp_client_utils import AgentCoreMCPClient
-from mcp_base.auth_utils import get_bearer_token_for_agent
+# Add mcp_base to path (its modules are imported lazily inside the cached factories)
+sys.path.append(os.path.join(os.path.dirname(__file__), 'mcp_base'))
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prompt sent to the orchestrator, with the user's query and sidebar preferences
+QUERY_TEMPLATE = string.Template("""$query
+
+Analysis preferences:
+- Material grade: $grade
+- Include labor costs: $labor
+- Provide costs in Australian dollars
+- Use MCP protocol for agent communication
+- Include detailed breakdown and recommendations
+""")
+
+# Static page content, built once at import rather than on every rerun
+SIDEBAR_MCP_ADVANTAGES_MD = """
+- **Standardized Protocol**: Reliable communication
+- **Enhanced Security**: JWT token authentication
+- **Tool Discovery**: Automatic capability detection
+- **Error Handling**: Built-in retry mechanisms
+- **Observability**: Detailed communication logs
+"""
+
+ARCHITECTURE_MD = """
+    ### 🔗 **MCP Multi-Agent Architecture**
+    
+    **🎯 Orchestrator Agent (MCP)**
+    - Coordinates entire workflow via MCP protocol
+    - Routes queries to specialized agents
+    - Synthesizes results with enhanced reliability
+    
+    **🏠 LangGraph Agent (MCP)**
+    - Kitchen layout analysis via MCP
+    - YOLO object detection with secure communication
+    - Spatial measurements and assessments
+    
+    **💰 CrewAI Agent (MCP)**
+    - Multi-agent cost estimation team via MCP
+    - Specialized roles with standardized communication
+    - Australian market pricing integration
+    """
+
+TECH_STACK_MD = """
+    ### 🚀 **MCP Technology Stack**
+    
+    ✅ **Model Context Protocol (MCP)**  
+    ✅ **Amazon Bedrock AgentCore Runtime**  
+    ✅ **Standardized agent communication**  
+    ✅ **JWT authentication & authorization**  
+    ✅ **Enhanced error handling & retries**  
+    ✅ **Tool discovery & introspection**  
+    ✅ **Australian market pricing**
+    
+    ### 🔗 **MCP Advantages**
+    - Reliable agent-to-agent communication
+    - Built-in security and authentication
+    - Standardized protocol compliance
+    - Enhanced observability and debugging
+    - Automatic tool discovery capabilities
+    """
+
+FOOTER_HTML = """
+<div style='text-align: center'>
+<p><strong>🔗 MCP Multi-Agent Kitchen Renovation System</strong></p>
+<p>Powered by Model Context Protocol | Amazon Bedrock AgentCore | LangGraph + CrewAI + Orchestrator</p>
+<p><em>Experience the future of secure, standardized agent communication!</em></p>
+</div>
+"""
+
 # Page configuration
 st.set_page_config(
     page_title="Kitchen Renovation Multi-Agent System (MCP)",
@@ -31,21 +106,339 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize MCP clients
+# Authentication mode for agent runtimes: "sigv4" (default, IAM) or "jwt" (Cognito bearer tokens)
+MCP_AUTH_MODE = os.environ.get("MCP_AUTH_MODE", "sigv4")
+
+# Cognito access tokens are cached for just under an hour
+TOKEN_CACHE_TTL = 3300
+# Refetch a cached token this many seconds before its JWT expiry
+TOKEN_EXPIRY_MARGIN = 60
+
+# Cache hit/miss instrumentation - the counters live in a cached resource because
+# Streamlit re-executes this module (and would reset module-level state) on every rerun
 @st.cache_resource
-def get_orchestrator_client():
-    """Get cached orchestrator MCP client"""
-    return AgentCoreMCPClient(region="us-west-2")
+def _cache_stats() -> Dict[str, Counter]:
+    """Per-function call and miss counters shared across reruns and sessions"""
+    return {"calls": Counter(), "misses": Counter()}
 
-@st.cache_resource 
-def get_langgraph_client():
-    """Get cached LangGraph MCP client"""
-    return AgentCoreMCPClient(region="us-west-2")
+def instrumented(cache_decorator):
+    """
+    Apply a Streamlit cache decorator and count calls and cache misses per function
     
+    Misses are counted inside the cached body (it only runs on a miss), calls outside it.
+    """
+    def decorate(fn):
+        name = fn.__name__
+        
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _cache_stats()["misses"][name] += 1
+            return fn(*args, **kwargs)
+        
+        cached = cache_decorator(body)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _cache_stats()["calls"][name] += 1
+            return cached(*args, **kwargs)
+        
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorate
+
+@st.cache_resource
+def _token_generations() -> Counter:
+    """
+    Per-agent token refresh count
+    
+    It is part of _fetch_bearer_token's cache key, so one agent's token can be refetched
+    without clearing the others.
+    """
+    return Counter()
+
+@instrumented(st.cache_data(ttl=TOKEN_CACHE_TTL, show_spinner=False))
+def _fetch_bearer_token(agent_name: str, generation: int = 0) -> str:
+    """Fetch a bearer token for an agent (Secrets Manager / STS round trip)"""
+    from mcp_base.auth_utils import get_bearer_token_for_agent
+    return get_bearer_token_for_agent(agent_name)
+
+def _jwt_seconds_remaining(token: str) -> Optional[float]:
+    """Seconds until a JWT's exp claim, or None if the token is not a decodable JWT"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims["exp"] - time.time()
+    except Exception:
+        return None
+
+def _cached_token(agent_name: str) -> str:
+    """Get a bearer token for an agent, refetching only when the cached one is about to expire"""
+    generations = _token_generations()
+    token = _fetch_bearer_token(agent_name, generations[agent_name])
+    remaining = _jwt_seconds_remaining(token)
+    if remaining is not None and remaining < TOKEN_EXPIRY_MARGIN:
+        # Move only this agent to a new cache entry; the stale one ages out with the TTL
+        generations[agent_name] += 1
+        token = _fetch_bearer_token(agent_name, generations[agent_name])
+    return token
+
+# Initialize MCP client
+@instrumented(st.cache_resource)
+def get_mcp_client():
+    """Get the shared MCP client - one HTTP connection pool for every agent"""
+    from mcp_base.mcp_client_utils import AgentCoreMCPClient, create_http_session
+    
+    client = AgentCoreMCPClient(
+        region="us-west-2",
+        timeout=MCP_CALL_TIMEOUT,  # bounds each attempt - the client returns an error dict on timeout
+        http_session=create_http_session(pool_maxsize=32),
+        token_provider=_cached_token if MCP_AUTH_MODE == "jwt" else None
+    )
+    atexit.register(client.close)
+    return client
+
+# Maximum number of in-flight MCP tool calls (AgentCore rate limits)
+MCP_CONCURRENCY = 3
+# Materials sent to CrewAI when LangGraph doesn't return any
+DEFAULT_MATERIALS = (
+    {"type": "granite", "area": 8.0},
+    {"type": "wood", "area": 15.0},
+    {"type": "tile", "area": 12.0}
+)
+# S3 bucket for uploaded kitchen images - agents receive an s3:// URI instead of image bytes.
+# When unset, uploads stay local to the UI host and no image reference is sent.
+KITCHEN_IMAGE_BUCKET = os.environ.get("KITCHEN_IMAGE_BUCKET")
+
 @st.cache_resource
-def get_crewai_client():
-    """Get cached CrewAI MCP client"""  
-    return AgentCoreMCPClient(region="us-west-2")
+def _s3():
+    """Get the shared S3 client"""
+    import boto3
+    return boto3.client("s3", region_name="us-west-2")
+
+def upload_kitchen_image(path: str, file_id: str) -> str:
+    """
+    Upload a saved kitchen image to S3 (multipart for large files)
+    
+    Args:
+        path: Local path of the saved upload
+        file_id: Streamlit upload ID, used to build a unique object key
+        
+    Returns:
+        s3:// URI of the uploaded image
+    """
+    from boto3.s3.transfer import TransferConfig
+    
+    key = f"kitchen-images/{file_id}{Path(path).suffix}"
+    _s3().upload_file(
+        path, KITCHEN_IMAGE_BUCKET, key,
+        Config=TransferConfig(multipart_threshold=8 * 1024 * 1024, use_threads=True, max_concurrency=4)
+    )
+    return f"s3://{KITCHEN_IMAGE_BUCKET}/{key}"
+
+# Tool latency entries kept per session for the dashboard
+MAX_LATENCY_HISTORY = 100
+# Per-attempt bound on a single MCP tool call (the HTTP client timeout), and attempts before giving up
+MCP_CALL_TIMEOUT = 90
+MCP_CALL_TRIES = 3
+# Tools that start a long, non-idempotent workflow - a failed call is reported, not re-run
+NO_RETRY_TOOLS = frozenset({"orchestrate_full_workflow", "orchestrate_renovation_workflow"})
+
+async def call_with_retries(coro_factory: Callable[[], Awaitable[Dict[str, Any]]],
+                            tries: int = MCP_CALL_TRIES) -> Dict[str, Any]:
+    """
+    Await an MCP tool call, retrying with exponential backoff while it returns an error
+    
+    AgentCoreMCPClient reports failures (including HTTP timeouts) as {"error": ...} results
+    instead of raising, so those are what gets retried. Each attempt is bounded by the
+    client's own HTTP timeout; there is no asyncio deadline on top, because cancelling the
+    await would leave the request running in its worker thread.
+    
+    Args:
+        coro_factory: Zero-argument callable returning a fresh coroutine for each attempt
+        tries: Total number of attempts
+        
+    Returns:
+        The first successful result, or the last error result
+    """
+    for attempt in range(tries):
+        result = await coro_factory()
+        if not (isinstance(result, dict) and "error" in result) or attempt == tries - 1:
+            return result
+        logger.warning(f"MCP call attempt {attempt + 1}/{tries} failed ({result['error']}), retrying...")
+        await asyncio.sleep(0.5 * (2 ** attempt))
+
+async def run_workflow(enhanced_query: str, cost_grade: str, latencies: Optional[List[Dict[str, Any]]] = None,
+                       on_progress: Optional[Callable[[int, int], None]] = None,
+                       image_s3_uri: Optional[str] = None) -> List[Any]:
+    """
+    Run the orchestrator workflow and the direct-agent fallback chain concurrently
+    
+    The fallback chain calls LangGraph and then CrewAI (which needs LangGraph's
+    materials), so its latency overlaps the orchestrator call instead of following it.
+    
+    Args:
+        enhanced_query: Full analysis prompt for the orchestrator
+        cost_grade: Material grade (economy, standard, premium)
+        latencies: Optional list that receives one {"tool", "seconds"} entry per tool call
+        on_progress: Optional callback invoked as (branches_done, branches_total) each time
+            a branch finishes - called from the event loop thread
+        image_s3_uri: Optional s3:// URI of the uploaded kitchen image, passed to the
+            orchestrator and LangGraph tools (which read it from S3 themselves)
+    
+    Returns:
+        [orchestrator_result, (langgraph_result, crewai_result)] - either entry may be
+        an exception instance if that branch raised
+    """
+    semaphore = asyncio.Semaphore(MCP_CONCURRENCY)
+    client = get_mcp_client()
+    image_kwargs = {"image_s3_uri": image_s3_uri} if image_s3_uri else {}
+    
+    async def call_tool(agent_name: str, tool_name: str, **kwargs) -> Dict[str, Any]:
+        async with semaphore:
+            call_start_ns = time.perf_counter_ns()
+            try:
+                return await call_with_retries(
+                    lambda: client.invoke_agent_tool(agent_name, tool_name, **kwargs),
+                    tries=1 if tool_name in NO_RETRY_TOOLS else MCP_CALL_TRIES
+                )
+            finally:
+                if latencies is not None:
+                    latencies.append({
+                        "tool": f"{agent_name}.{tool_name}",
+                        "seconds": round((time.perf_counter_ns() - call_start_ns) / 1e9, 2)
+                    })
+    
+    async def fallback_chain():
+        langgraph_result = await call_tool(
+            "langgraph_agent",
+            "analyze_kitchen",
+            prompt=f"Analyze kitchen for renovation planning with {cost_grade} grade materials",
+            **image_kwargs
+        )
+        if "error" in langgraph_result:
+            return langgraph_result, {}
+        
+        # Extract materials for CrewAI
+        materials_data = []
+        if "data" in langgraph_result:
+            materials_data = langgraph_result["data"].get("materials", [])
+        
+        crewai_result = await call_tool(
+            "crewai_agent",
+            "estimate_costs",
+            materials_data=materials_data or list(DEFAULT_MATERIALS),
+            cost_grade=cost_grade
+        )
+        return langgraph_result, crewai_result
+    
+    tasks = [
+        asyncio.ensure_future(call_tool(
+            "orchestrator_agent",
+            "orchestrate_renovation_workflow",
+            user_query=enhanced_query,
+            cost_grade=cost_grade,
+            **image_kwargs
+        )),
+        asyncio.ensure_future(fallback_chain())
+    ]
+    
+    # Report each branch as it finishes rather than waiting for the slowest one
+    for done, finished in enumerate(asyncio.as_completed(tasks), 1):
+        try:
+            await finished
+        except Exception:
+            pass  # surfaced below, in task order
+        if on_progress:
+            on_progress(done, len(tasks))
+    
+    return [task.exception() or task.result() for task in tasks]
+
+class AnalysisFailed(RuntimeError):
+    """Raised by run_analysis when the orchestrator failed, carrying the uncached results"""
+    
+    def __init__(self, analysis: Dict[str, Any]):
+        super().__init__(analysis["orchestrator_result"].get("error", "Unknown error"))
+        self.analysis = analysis
+
+@instrumented(st.cache_data(ttl=1800, show_spinner=False))
+def run_analysis(query: str, cost_grade: str, include_labor: bool, image_s3_uri: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the MCP multi-agent workflow and return JSON-serializable results
+    
+    Cached on (query, cost_grade, include_labor, image_s3_uri) so repeating an analysis with
+    unchanged inputs returns instantly. The only element created here is the
+    per-branch progress bar (Streamlit replays it on cache hits); results are
+    rendered by the caller. Raises AnalysisFailed when the orchestrator fails so
+    only that entry stays uncached.
+    """
+    communication_log = [{
+        "timestamp": datetime.now().isoformat(),
+        "action": "Calling orchestrator_agent.orchestrate_full_workflow",
+        "protocol": "MCP"
+    }]
+    
+    tool_latencies = []
+    
+    # The workflow runs on the background loop; branch completions are handed back through
+    # a queue so the progress bar is only touched from this (the script) thread
+    progress_updates = queue.SimpleQueue()
+    branch_progress = st.progress(0, text="⏳ Waiting for MCP agents...")
+    future = submit_async(run_workflow(
+        query, cost_grade, tool_latencies,
+        on_progress=lambda done, total: progress_updates.put((done, total)),
+        image_s3_uri=image_s3_uri
+    ))
+    while not future.done() or not progress_updates.empty():
+        try:
+            done, total = progress_updates.get(timeout=0.25)
+        except queue.Empty:
+            continue
+        branch_progress.progress(int(100 * done / total), text=f"✅ {done}/{total} MCP branches done")
+    
+    orchestrator_outcome, fallback_outcome = future.result()
+    
+    if isinstance(orchestrator_outcome, Exception):
+        orchestrator_result = {"error": str(orchestrator_outcome)}
+        communication_log.append({
+            "timestamp": datetime.now().isoformat(),
+            "error": str(orchestrator_outcome),
+            "protocol": "MCP"
+        })
+    else:
+        orchestrator_result = orchestrator_outcome
+        communication_log.append({
+            "timestamp": datetime.now().isoformat(),
+            "result": "Orchestrator workflow completed" if "error" not in orchestrator_result else "Orchestrator workflow failed",
+            "protocol": "MCP"
+        })
+    
+    langgraph_result = {}
+    crewai_result = {}
+    fallback_error = None
+    
+    if "error" not in orchestrator_result:
+        # Extract sub-results if available
+        if "data" in orchestrator_result and isinstance(orchestrator_result["data"], dict):
+            workflow_data = orchestrator_result["data"]
+            langgraph_result = workflow_data.get("kitchen_analysis", {})
+            crewai_result = workflow_data.get("cost_estimation", {})
+    elif isinstance(fallback_outcome, Exception):
+        fallback_error = str(fallback_outcome)
+    else:
+        langgraph_result, crewai_result = fallback_outcome
+    
+    analysis = {
+        "orchestrator_result": orchestrator_result,
+        "langgraph_result": langgraph_result,
+        "crewai_result": crewai_result,
+        "fallback_error": fallback_error,
+        "communication_log": communication_log,
+        "tool_latencies": tool_latencies
+    }
+    if "error" in orchestrator_result:
+        # Raising keeps this entry out of the cache, so the next click retries it
+        raise AnalysisFailed(analysis)
+    return analysis
 
 # Title and description
 st.title("🏠 Kitchen Renovation Multi-Agent System")
@@ -56,19 +449,22 @@ st.markdown("Experience secure, standardized agent-to-agent communication via MC
 st.sidebar.header("🔗 MCP Protocol Status")
 
 # Check agent ecosystem
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def check_agent_ecosystem():
-    """Check MCP agent ecosystem status"""
+@instrumented(st.cache_resource(ttl=300))  # Shared across sessions, refreshed every 5 minutes
+def check_agent_ecosystem() -> Mapping[str, Any]:
+    """Check MCP agent ecosystem status (read-only, shared between sessions)"""
     try:
-        client = get_orchestrator_client()
+        client = get_mcp_client()
         # ecosystem_info = asyncio.run(discover_available_agents("us-west-2"))
         ecosystem_info = {"agents": ["orchestrator_agent", "langgraph_agent", "crewai_agent"]}
-        return ecosystem_info
+        return MappingProxyType(ecosystem_info)
     except Exception as e:
         logger.error(f"Failed to check ecosystem: {e}")
-        return {}
+        return MappingProxyType({})
 
-ecosystem_info = check_agent_ecosystem()
+# Only look the ecosystem up once per browser session
+if "_ecosystem_info" not in st.session_state:
+    st.session_state["_ecosystem_info"] = check_agent_ecosystem()
+ecosystem_info = st.session_state["_ecosystem_info"]
 if ecosystem_info:
     st.sidebar.success("✅ MCP Ecosystem: Online")
     for agent_name, tools in ecosystem_info.items():
@@ -95,13 +491,7 @@ debug_mode = st.sidebar.checkbox("🔧 Debug Mode", value=False, help="Show MCP
 # MCP Protocol Information
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🔗 MCP Advantages")
-st.sidebar.markdown("""
-- **Standardized Protocol**: Reliable communication
-- **Enhanced Security**: JWT token authentication
-- **Tool Discovery**: Automatic capability detection
-- **Error Handling**: Built-in retry mechanisms
-- **Observability**: Detailed communication logs
-""")
+st.sidebar.markdown(SIDEBAR_MCP_ADVANTAGES_MD)
 
 # Main interface
 st.header("🎯 MCP Multi-Agent Kitchen Analysis")
@@ -114,6 +504,7 @@ input_method = st.radio(
 )
 
 user_query = ""
+image_s3_uri = None
 
 if input_method == "Text Description":
     user_query = st.text_area(
@@ -130,9 +521,30 @@ elif input_method == "Upload Image":
     )
     
     if uploaded_file is not None:
-        # Display the uploaded image
-        image = Image.open(uploaded_file)
-        st.image(image, caption="Uploaded Kitchen Image", width="stretch")
+        # Stream the upload to disk in 1 MB chunks - only when a different file is uploaded,
+        # not on every unrelated rerun
+        if st.session_state.get("kitchen_image_id") != uploaded_file.file_id:
+            previous_path = st.session_state.get("kitchen_image_path")
+            with tempfile.NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix, delete=False) as tmp_file:
+                shutil.copyfileobj(uploaded_file, tmp_file, length=1 << 20)
+            st.session_state["kitchen_image_path"] = tmp_file.name
+            st.session_state["kitchen_image_id"] = uploaded_file.file_id
+            if previous_path and os.path.exists(previous_path):
+                os.unlink(previous_path)
+            
+            # Hand agents an S3 reference rather than embedding the image in MCP payloads
+            st.session_state["kitchen_image_s3_uri"] = None
+            if KITCHEN_IMAGE_BUCKET:
+                try:
+                    st.session_state["kitchen_image_s3_uri"] = upload_kitchen_image(tmp_file.name, uploaded_file.file_id)
+                except Exception as e:
+                    logger.error(f"Failed to upload kitchen image to S3: {e}")
+                    st.warning("⚠️ Could not upload the image to S3 - agents will use the text description only")
+        
+        image_s3_uri = st.session_state.get("kitchen_image_s3_uri")
+        
+        # Display the uploaded image from disk
+        st.image(st.session_state["kitchen_image_path"], caption="Uploaded Kitchen Image", width="stretch")
         
         user_query = f"I've uploaded a kitchen image. Please analyze this kitchen for renovation planning via MCP protocol with {cost_grade} grade materials. Include labor costs: {include_labor}. Provide detailed cost estimates in Australian dollars."
 
@@ -140,16 +552,7 @@ elif input_method == "Upload Image":
 if st.button("🚀 Run MCP Multi-Agent Analysis", type="primary", disabled=not user_query):
     
     # Enhanced query with MCP context
-    enhanced_query = f"""
-    {user_query}
-    
-    Analysis preferences:
-    - Material grade: {cost_grade}
-    - Include labor costs: {include_labor}
-    - Provide costs in Australian dollars
-    - Use MCP protocol for agent communication
-    - Include detailed breakdown and recommendations
-    """
+    enhanced_query = QUERY_TEMPLATE.substitute(query=user_query, grade=cost_grade, labor=include_labor)
     
     # Create containers for real-time updates
     with st.container():
@@ -175,129 +578,66 @@ if st.button("🚀 Run MCP Multi-Agent Analysis", type="primary", disabled=not u
             thinking_header = st.empty()
             thinking_content = st.empty()
         
+        # Bound up front so the cleanup below can drop them however far the run got
+        analysis = analysis_data = orchestrator_result = langgraph_result = crewai_result = None
         try:
-            orchestrator_client = get_orchestrator_client()
-            langgraph_client = get_langgraph_client()  
-            crewai_client = get_crewai_client()
-            
-            # Start timer
-            import time
-            start_time = time.time()
-            
-            # Initialize variables for results
-            langgraph_result = {}
-            crewai_result = {}
-            orchestrator_result = {}
+            # Start timer (monotonic, unaffected by wall-clock adjustments)
+            start_ns = time.perf_counter_ns()
             
             thinking_header.markdown("#### 🔗 MCP Agent Workflow:")
             
-            # Step 1: Direct Orchestrator Call (which will coordinate other agents via MCP)
-            progress_bar.progress(20, text="🎯 Step 1: Calling Orchestrator via MCP...")
+            # Step 1: Orchestrator call (which coordinates other agents via MCP), with the
+            # direct LangGraph -> CrewAI fallback chain running alongside it
+            progress_bar.progress(20, text="🎯 Step 1: Calling Orchestrator via MCP (fallback agents in parallel)...")
             thinking_content.text("🎯 **MCP ORCHESTRATOR** - Coordinating multi-agent workflow via Model Context Protocol...")
             
-            communication_log.append({
-                "timestamp": datetime.now().isoformat(),
-                "action": "Calling orchestrator_agent.orchestrate_full_workflow",
-                "protocol": "MCP"
-            })
-            
             with st.spinner("🔗 MCP Orchestrator working... (60s expected)"):
                 try:
-                    # Call orchestrator which will coordinate other agents via MCP
-                    orchestrator_result = asyncio.run(
-                        orchestrator_client.invoke_agent_tool(
-                            "orchestrator_agent",
-                            "orchestrate_renovation_workflow", 
-                            user_query=enhanced_query,
-                            cost_grade=cost_grade
-                        )
-                    )
-                    
-                    communication_log.append({
-                        "timestamp": datetime.now().isoformat(),
-                        "result": "Orchestrator workflow completed" if "error" not in orchestrator_result else "Orchestrator workflow failed",
-                        "protocol": "MCP"
-                    })
-                    
-                    if "error" not in orchestrator_result:
-                        thinking_content.success("✅ **MCP Orchestrator Complete:** Full workflow coordinated via MCP protocol")
-                        
-                        # Extract sub-results if available
-                        if "data" in orchestrator_result and isinstance(orchestrator_result["data"], dict):
-                            workflow_data = orchestrator_result["data"]
-                            langgraph_result = workflow_data.get("kitchen_analysis", {})
-                            crewai_result = workflow_data.get("cost_estimation", {})
-                            
-                        # Show orchestrator results
-                        with st.expander("🎯 **MCP Orchestrator Results** - Multi-Agent Coordination", expanded=False):
-                            st.json(orchestrator_result)
-                    else:
-                        thinking_content.error(f"❌ MCP Orchestrator failed: {orchestrator_result.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    thinking_content.error(f"❌ MCP Orchestrator failed: {str(e)}")
-                    communication_log.append({
-                        "timestamp": datetime.now().isoformat(),
-                        "error": str(e),
-                        "protocol": "MCP"
-                    })
-                    orchestrator_result = {"error": str(e)}
+                    analysis = run_analysis(enhanced_query, cost_grade, include_labor, image_s3_uri)
+                except AnalysisFailed as failed:
+                    # Not cached, but the fallback results are still shown below
+                    analysis = failed.analysis
             
-            # Show MCP communication log in debug mode
-            if debug_mode:
-                with mcp_log_container:
-                    mcp_log.json(communication_log)
+            latencies = st.session_state.setdefault("latencies", [])
+            latencies.extend(analysis["tool_latencies"])
+            del latencies[:-MAX_LATENCY_HISTORY]  # bound per-session memory
+            
+            orchestrator_result = analysis["orchestrator_result"]
+            langgraph_result = analysis["langgraph_result"]
+            crewai_result = analysis["crewai_result"]
+            communication_log = analysis["communication_log"]
+            
+            if "error" not in orchestrator_result:
+                thinking_content.success("✅ **MCP Orchestrator Complete:** Full workflow coordinated via MCP protocol")
+                
+                # Show orchestrator results
+                with st.expander("🎯 **MCP Orchestrator Results** - Multi-Agent Coordination", expanded=False):
+                    st.json(orchestrator_result)
+            else:
+                thinking_content.error(f"❌ MCP Orchestrator failed: {orchestrator_result.get('error', 'Unknown error')}")
             
-            # Step 2: Optional Individual Agent Tests (if orchestrator failed)
+            # Step 2: Individual agent results (if orchestrator failed) - already fetched concurrently
             if "error" in orchestrator_result:
-                progress_bar.progress(40, text="🏠 Fallback: Testing LangGraph via MCP...")
-                thinking_content.text("🏠 **FALLBACK: LangGraph Agent** - Direct MCP call for kitchen analysis...")
+                progress_bar.progress(70, text="🏠 Fallback: Using direct LangGraph and CrewAI MCP results...")
                 
-                try:
-                    langgraph_result = asyncio.run(
-                        langgraph_client.invoke_agent_tool(
-                            "langgraph_agent",
-                            "analyze_kitchen",
-                            user_query=f"Analyze kitchen for renovation planning with {cost_grade} grade materials"
-                        )
-                    )
-                    
+                if analysis["fallback_error"]:
+                    thinking_content.warning(f"⚠️ Fallback tests also failed: {analysis['fallback_error']}")
+                else:
                     if "error" not in langgraph_result:
                         thinking_content.info("ℹ️ **Direct LangGraph Call:** Kitchen analysis completed")
-                        
-                        # Extract materials for CrewAI
-                        materials_data = []
-                        if "data" in langgraph_result:
-                            materials_data = langgraph_result["data"].get("materials", [])
-                        
-                        # Step 3: CrewAI Cost Estimation
-                        progress_bar.progress(70, text="💰 Fallback: Testing CrewAI via MCP...")
-                        thinking_content.text("💰 **FALLBACK: CrewAI Agent** - Direct MCP call for cost estimation...")
-                        
-                        crewai_result = asyncio.run(
-                            crewai_client.invoke_agent_tool(
-                                "crewai_agent",
-                                "estimate_costs",
-                                materials_data=materials_data if materials_data else [
-                                    {"type": "granite", "area": 8.0},
-                                    {"type": "wood", "area": 15.0},
-                                    {"type": "tile", "area": 12.0}
-                                ],
-                                cost_grade=cost_grade
-                            )
-                        )
-                        
-                        if "error" not in crewai_result:
-                            thinking_content.info("ℹ️ **Direct CrewAI Call:** Cost estimation completed")
-                
-                except Exception as e:
-                    thinking_content.warning(f"⚠️ Fallback tests also failed: {e}")
+                    if crewai_result and "error" not in crewai_result:
+                        thinking_content.info("ℹ️ **Direct CrewAI Call:** Cost estimation completed")
             
             # Finalize
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             progress_bar.progress(100, text="✅ MCP multi-agent workflow complete!")
             thinking_content.success(f"✅ **MCP Analysis Complete!** Total time: {elapsed:.1f}s")
             
+            # Show MCP communication log in debug mode - rendered once the workflow has finished
+            if debug_mode:
+                with mcp_log_container:
+                    mcp_log.json(communication_log)
+            
             # Process and display results
             with result_container:
                 st.markdown("---")
@@ -377,7 +717,7 @@ if st.button("🚀 Run MCP Multi-Agent Analysis", type="primary", disabled=not u
             
             st.download_button(
                 label="📥 Download MCP Analysis Report",
-                data=json.dumps(analysis_data, indent=2),
+                data=dumps_report(analysis_data),
                 file_name=f"mcp_kitchen_analysis_{int(time.time())}.json",
                 mime="application/json"
             )
@@ -393,6 +733,11 @@ if st.button("🚀 Run MCP Multi-Agent Analysis", type="primary", disabled=not u
                 st.text(f"Protocol: Model Context Protocol (MCP)")
                 if communication_log:
                     st.json(communication_log)
+        
+        finally:
+            # Drop this run's large results from the script namespace, on success or
+            # failure, so they aren't held until the next rerun replaces them
+            del analysis, analysis_data, orchestrator_result, langgraph_result, crewai_result, communication_log
 
 # Information sections
 st.markdown("---")
@@ -400,51 +745,30 @@ st.markdown("---")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.markdown("""
-    ### 🔗 **MCP Multi-Agent Architecture**
-    
-    **🎯 Orchestrator Agent (MCP)**
-    - Coordinates entire workflow via MCP protocol
-    - Routes queries to specialized agents
-    - Synthesizes results with enhanced reliability
-    
-    **🏠 LangGraph Agent (MCP)**
-    - Kitchen layout analysis via MCP
-    - YOLO object detection with secure communication
-    - Spatial measurements and assessments
-    
-    **💰 CrewAI Agent (MCP)**
-    - Multi-agent cost estimation team via MCP
-    - Specialized roles with standardized communication
-    - Australian market pricing integration
-    """)
+    st.markdown(ARCHITECTURE_MD)
 
 with col2:
-    st.markdown("""
-    ### 🚀 **MCP Technology Stack**
-    
-    ✅ **Model Context Protocol (MCP)**  
-    ✅ **Amazon Bedrock AgentCore Runtime**  
-    ✅ **Standardized agent communication**  
-    ✅ **JWT authentication & authorization**  
-    ✅ **Enhanced error handling & retries**  
-    ✅ **Tool discovery & introspection**  
-    ✅ **Australian market pricing**
-    
-    ### 🔗 **MCP Advantages**
-    - Reliable agent-to-agent communication
-    - Built-in security and authentication
-    - Standardized protocol compliance
-    - Enhanced observability and debugging
-    - Automatic tool discovery capabilities
-    """)
+    st.markdown(TECH_STACK_MD)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center'>
-<p><strong>🔗 MCP Multi-Agent Kitchen Renovation System</strong></p>
-<p>Powered by Model Context Protocol | Amazon Bedrock AgentCore | LangGraph + CrewAI + Orchestrator</p>
-<p><em>Experience the future of secure, standardized agent communication!</em></p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+# Cache and latency dashboard
+with st.sidebar.expander("🔍 Cache & Latency"):
+    stats = _cache_stats()
+    st.markdown("**Cache hits**")
+    st.table([
+        {
+            "function": name,
+            "calls": calls,
+            "misses": stats["misses"][name],
+            "hit ratio": f"{(calls - stats['misses'][name]) / calls:.0%}"
+        }
+        for name, calls in stats["calls"].items()
+    ])
+    st.markdown("**MCP tool latency (this session)**")
+    if st.session_state.get("latencies"):
+        st.table(st.session_state["latencies"][-20:])
+    else:
+        st.caption("No tool calls yet")
@@ -3,16 +3,196 @@ Streamlit UI for Kitchen Renovation Cost Estimator using MCP-Enhanced Orchestrat
 """
 
 import streamlit as st
+import io
 import json
 import os
+import re
+import string
 import sys
-from PIL import Image
 import tempfile
-import boto3
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(__file__))
-from utils import get_agent_arn_from_parameter_store, invoke_agent_with_boto3
+from json_utils import dumps_report
+from utils import get_agent_arn_from_parameter_store, get_agentcore_client, get_agent_arns_from_parameter_store, invoke_agent_with_boto3_stream
+
+QUERY_TEMPLATE = string.Template("""$query
+
+Additional preferences:
+- Material grade: $grade
+- Include labor costs: $labor
+- Provide costs in Australian dollars
+- Include detailed breakdown and recommendations
+""")
+
+# Typical (total, materials, labor) in AUD, shown when no costs can be extracted
+FALLBACK_BUDGETS = MappingProxyType({
+    "economy": (18500, 11000, 7500),
+    "standard": (25000, 15000, 10000),
+    "premium": (35000, 21000, 14000),
+})
+
+# (label, help) for the total / materials / labor budget metrics
+EXTRACTED_BUDGET_METRICS = (
+    ("💰 Total Project Cost", "Complete renovation cost including materials, labor, and contingency"),
+    ("🔨 Materials Cost", "Cost of all renovation materials"),
+    ("👷 Labor Cost", "Professional installation and labor costs"),
+)
+
+# Workflow steps shown while the orchestrator is running
+MCP_WORKFLOW_STEPS = (
+    "🔗 **MCP Protocol** - Discovering available agents and tools",
+    "🏠 **LangGraph Agent (MCP)** - Analyzing kitchen layout and materials",
+    "💰 **CrewAI Agent (MCP)** - Multi-agent cost estimation with enhanced protocol",
+)
+DIRECT_WORKFLOW_STEPS = (
+    "🏠 **LangGraph Agent** - Analyzing kitchen layout and materials",
+    "💰 **CrewAI Agent** - Multi-agent cost estimation team",
+)
+
+# Response parsing patterns, compiled once at import instead of on every click
+_THINKING_RE = re.compile(r'<thinking>.*?</thinking>', re.DOTALL)
+_EXEC_RE = re.compile(r'\[.*?Executing:.*?\]')
+_BLANKS_RE = re.compile(r'\n{3,}')
+
+# Single-pass cost scan: each alternative captures its amount in a named
+# group, so match.lastgroup tells which bucket the match belongs to
+_AMOUNT = r'[0-9][0-9,]*(?:\.[0-9]{2})?'
+_COST_SCAN_RE = re.compile(
+    r'(?:Total|Project|Budget)[^\n]{0,40}?\$?(?P<total>' + _AMOUNT + r')'
+    r'|AUD \$(?P<total_aud>' + _AMOUNT + r')'
+    r'|Materials?[^\n]{0,40}?\$?(?P<material>' + _AMOUNT + r')'
+    r'|Labou?r[^\n]{0,40}?\$?(?P<labor>' + _AMOUNT + r')',
+    re.IGNORECASE
+)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def find_project_estimate(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first ```json block containing a project_estimate, or None
+
+    Each fence is decoded in place with raw_decode, which stops at the end of
+    the object, so no regex has to find the closing fence first.
+    """
+    i = text.find('```json')
+    while i >= 0:
+        start = i + len('```json')
+        while start < len(text) and text[start].isspace():
+            start += 1
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict) and 'project_estimate' in obj:
+                return obj
+        except ValueError:
+            pass
+        i = text.find('```json', start)
+    return None
+
+
+def scan_costs(text: str) -> Dict[str, int]:
+    """
+    Pull the first total, material and labor amounts out of free text in one pass
+    
+    Amounts are returned as whole dollars.
+    """
+    found = {}
+    for match in _COST_SCAN_RE.finditer(text):
+        bucket = 'total' if match.lastgroup == 'total_aud' else match.lastgroup
+        if bucket not in found:
+            found[bucket] = int(float(match.group(match.lastgroup).replace(',', '')))
+        if len(found) == 3:
+            break
+    return found
+
+
+def render_budget(values: Tuple[Optional[int], ...], metrics: Tuple[Tuple[str, str], ...]):
+    """
+    Render the total / materials / labor metrics side by side, skipping unknown values
+    """
+    for col, value, (label, help_text) in zip(st.columns(3), values, metrics):
+        if value:
+            col.metric(label, f"${value:,} AUD", help=help_text)
+
+
+@st.cache_data(show_spinner=False)
+def image_thumbnail(data: bytes, max_side: int = 1024) -> bytes:
+    """
+    Downscaled JPEG preview of an uploaded image, cached on the file contents
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    if image.mode not in ("RGB", "L"):
+        # JPEG has no alpha channel or palette
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+@st.cache_data(ttl=300)
+def cached_arn(name: str) -> str:
+    """Parameter Store ARN lookup, cached for 5 minutes"""
+    return get_agent_arn_from_parameter_store(name)
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def run_orchestrator(arn: str, query: str) -> Tuple[str, str]:
+    """
+    Invoke the orchestrator and return (raw response text, parsed response text)
+    
+    The parsed text joins the SSE 'data:' payloads with their JSON string quotes
+    removed; a response without SSE lines is returned unchanged as both.
+    
+    The response is streamed into a placeholder while it arrives. Results are
+    cached on (arn, query), so re-running an identical analysis - e.g. after
+    toggling debug mode - returns instantly instead of re-invoking the agents.
+    
+    Raises RuntimeError if the invocation fails, even partway through the stream;
+    st.cache_data doesn't cache exceptions, so only successful responses are kept.
+    """
+    stream_placeholder = st.empty()
+    raw_lines = []
+    streamed = []
+    for line in invoke_agent_with_boto3_stream(arn, query, client=get_agentcore_client()):
+        # The stream reports failures as a final "Error: ..." line
+        if line.startswith('Error:'):
+            stream_placeholder.empty()
+            raise RuntimeError(line[len('Error:'):].strip())
+        raw_lines.append(line)
+        if line.startswith('data: '):
+            content = line[6:].strip()
+            if len(content) >= 2 and content[0] == '"' and content[-1] == '"':
+                content = content[1:-1]
+            streamed.append(content)
+            stream_placeholder.markdown(''.join(streamed))
+    # The cleaned, full analysis is rendered by the caller once parsing is done
+    stream_placeholder.empty()
+    raw = '\n'.join(raw_lines)
+    return raw, (''.join(streamed) if streamed else raw)
+
+
+@st.cache_data(ttl=300)
+def cached_agent_status(names: Tuple[str, ...]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Sidebar status lookups in one batched GetParameters call, cached for 5 minutes
+    
+    Returns (arns, errors), both keyed by agent name.
+    """
+    try:
+        arns = get_agent_arns_from_parameter_store(list(names))
+    except Exception as e:
+        return {}, {name: str(e) for name in names}
+    errors = {name: "Parameter not found" for name in names if name not in arns}
+    return arns, errors
+
 
 # Page configuration
 st.set_page_config(
@@ -36,6 +216,8 @@ protocol_mode = st.sidebar.selectbox(
     index=0,
     help="Choose between MCP protocol for enhanced reliability or direct AgentCore calls"
 )
+is_mcp = protocol_mode.startswith("MCP")
+protocol_label = "MCP" if is_mcp else "Direct AgentCore"
 
 cost_grade = st.sidebar.selectbox(
     "Material Grade",
@@ -55,7 +237,7 @@ else:
 
 # Display protocol information
 with st.sidebar.expander("ℹ️ Protocol Information"):
-    if "MCP" in protocol_mode:
+    if is_mcp:
         st.markdown("""
         **MCP Benefits:**
         - ✅ Standardized communication
@@ -73,7 +255,7 @@ with st.sidebar.expander("ℹ️ Protocol Information"):
         """)
 
 # Main interface
-st.header(f"🎯 Multi-Agent Analysis ({protocol_mode.split(' (')[0]})")
+st.header(f"🎯 Multi-Agent Analysis ({protocol_label})")
 
 # Input options
 input_method = st.radio(
@@ -99,9 +281,8 @@ elif input_method == "Upload Image":
     )
     
     if uploaded_file is not None:
-        # Display the uploaded image
-        image = Image.open(uploaded_file)
-        st.image(image, caption="Uploaded Kitchen Image", use_container_width=True)
+        # Display the uploaded image (decoded and downscaled once per file)
+        st.image(image_thumbnail(uploaded_file.getvalue()), caption="Uploaded Kitchen Image", use_container_width=True)
         
         user_query = f"I've uploaded a kitchen image. Please analyze this kitchen for renovation planning with {cost_grade} grade materials. Include labor costs: {include_labor}. Provide detailed cost estimates in Australian dollars."
 
@@ -109,22 +290,14 @@ elif input_method == "Upload Image":
 if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_query):
     
     # Add cost preferences to the query
-    enhanced_query = f"""
-    {user_query}
-    
-    Additional preferences:
-    - Material grade: {cost_grade}
-    - Include labor costs: {include_labor}
-    - Provide costs in Australian dollars
-    - Include detailed breakdown and recommendations
-    """
+    enhanced_query = QUERY_TEMPLATE.substitute(query=user_query, grade=cost_grade, labor=include_labor)
     
     # Determine which orchestrator to use
-    orchestrator_name = "mcp_orchestrator_agent" if "MCP" in protocol_mode else "orchestrator_agent"
+    orchestrator_name = "mcp_orchestrator_agent" if is_mcp else "orchestrator_agent"
     
     # Create containers for real-time updates
     with st.container():
-        st.markdown(f"### 🤖 Multi-Agent Analysis in Progress ({protocol_mode.split(' (')[0]})...")
+        st.markdown(f"### 🤖 Multi-Agent Analysis in Progress ({protocol_label})...")
         
         # Create real-time status containers
         progress_container = st.container()
@@ -132,7 +305,7 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
         result_container = st.container()
         
         with progress_container:
-            progress_bar = st.progress(0, text=f"🎯 Initializing {protocol_mode.split(' (')[0]} orchestrator...")
+            progress_bar = st.progress(0, text=f"🎯 Initializing {protocol_label} orchestrator...")
             status_text = st.empty()
         
         with thinking_container:
@@ -141,13 +314,12 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
         
         try:
             # Get orchestrator agent ARN
-            orchestrator_arn = get_agent_arn_from_parameter_store(orchestrator_name)
+            orchestrator_arn = cached_arn(orchestrator_name)
             
             # Multi-step agent workflow
-            thinking_header.markdown(f"#### 🤖 {protocol_mode.split(' (')[0]} Multi-Agent Workflow:")
+            thinking_header.markdown(f"#### 🤖 {protocol_label} Multi-Agent Workflow:")
             
             # Start timer
-            import time
             start_time = time.time()
             
             # Initialize variables
@@ -156,82 +328,41 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
             crewai_result = ""
             crewai_data = None
             
-            # Enhanced workflow for MCP
-            if "MCP" in protocol_mode:
-                # MCP-enhanced workflow
-                progress_bar.progress(20, text="🔗 Step 1: MCP Agent Discovery...")
-                thinking_content.text("🔍 **STEP 1: MCP Protocol** - Discovering available agents and tools...")
-                
-                progress_bar.progress(40, text="🏠 Step 2: LangGraph via MCP...")
-                thinking_content.text("🔍 **STEP 2: LangGraph Agent (MCP)** - Analyzing kitchen layout and materials...")
-                
-                progress_bar.progress(70, text="💰 Step 3: CrewAI via MCP...")
-                thinking_content.text("💰 **STEP 3: CrewAI Agent (MCP)** - Multi-agent cost estimation with enhanced protocol...")
-                
-            else:
-                # Traditional workflow
-                progress_bar.progress(20, text="🏠 Step 1: LangGraph analyzing kitchen...")
-                thinking_content.text("🔍 **STEP 1: LangGraph Agent** - Analyzing kitchen layout and materials...")
-                
-                progress_bar.progress(60, text="💰 Step 2: CrewAI estimating costs...")
-                thinking_content.text("💰 **STEP 2: CrewAI Agent** - Multi-agent cost estimation team...")
+            # The orchestrator runs every step in one call, so show the plan once
+            # instead of stepping a progress bar through placeholder stages
+            workflow_steps = MCP_WORKFLOW_STEPS if is_mcp else DIRECT_WORKFLOW_STEPS
+            progress_bar.progress(20, text=f"🎯 Running {protocol_label} workflow...")
+            thinking_content.markdown("\n".join(f"- {step}" for step in workflow_steps))
             
             with st.spinner(f"🔄 {orchestrator_name.replace('_', ' ').title()} working... (45s expected for MCP, 25s for direct)"):
                 try:
-                    # Single orchestrator call (both MCP and direct)
-                    result = invoke_agent_with_boto3(orchestrator_arn, enhanced_query)
+                    # Single orchestrator call (both MCP and direct), rendered as it streams in
+                    with result_container:
+                        result, parsed_result = run_orchestrator(orchestrator_arn, enhanced_query)
                     
                     # For MCP mode, the orchestrator handles all agent communications internally
                     # Parse any structured data from the response
                     try:
                         # Try to extract JSON data if present
-                        if "```json" in result:
-                            json_blocks = []
-                            import re
-                            json_matches = re.finditer(r"```json\s*([\s\S]*?)\s*```", result)
-                            for match in json_matches:
-                                try:
-                                    json_data = json.loads(match.group(1))
-                                    if 'project_estimate' in json_data:
-                                        crewai_data = json_data
-                                        break
-                                except json.JSONDecodeError:
-                                    continue
+                        crewai_data = find_project_estimate(result)
                         
-                        thinking_content.success(f"✅ **{protocol_mode.split(' (')[0]} Analysis Complete!** Enhanced protocol benefits realized")
+                        thinking_content.success(f"✅ **{protocol_label} Analysis Complete!** Enhanced protocol benefits realized")
                         
                     except Exception:
-                        thinking_content.success(f"✅ **{protocol_mode.split(' (')[0]} Analysis Complete!**")
+                        thinking_content.success(f"✅ **{protocol_label} Analysis Complete!**")
                         
                 except Exception as e:
                     thinking_content.error(f"❌ {orchestrator_name} failed: {str(e)}")
-                    result = f"Error: {str(e)}"
+                    result = parsed_result = f"Error: {str(e)}"
             
             elapsed = time.time() - start_time
-            progress_bar.progress(100, text=f"✅ {protocol_mode.split(' (')[0]} workflow complete!")
-            thinking_content.success(f"✅ **Analysis Complete!** Total time: {elapsed:.1f}s (Protocol: {protocol_mode.split(' (')[0]})")
-            
-            # Parse and clean the streaming response
-            import re
+            progress_bar.progress(100, text=f"✅ {protocol_label} workflow complete!")
+            thinking_content.success(f"✅ **Analysis Complete!** Total time: {elapsed:.1f}s (Protocol: {protocol_label})")
             
-            # Handle streaming format from orchestrator
-            if isinstance(result, str) and 'data: ' in result:
-                lines = result.split('\n')
-                content_lines = []
-                for line in lines:
-                    if line.startswith('data: '):
-                        content = line.replace('data: ', '').strip()
-                        if content.startswith('"') and content.endswith('"'):
-                            content = content[1:-1]
-                        content_lines.append(content)
-                parsed_result = ''.join(content_lines)
-            else:
-                parsed_result = str(result)
-            
-            # Clean up the response
-            cleaned_result = re.sub(r'<thinking>.*?</thinking>', '', parsed_result, flags=re.DOTALL)
-            cleaned_result = re.sub(r'\[.*?Executing:.*?\]', '', cleaned_result)
-            cleaned_result = re.sub(r'\n{3,}', '\n\n', cleaned_result).strip()
+            # Clean up the response (run_orchestrator already unwrapped the SSE stream)
+            cleaned_result = _THINKING_RE.sub('', parsed_result)
+            cleaned_result = _EXEC_RE.sub('', cleaned_result)
+            cleaned_result = _BLANKS_RE.sub('\n\n', cleaned_result).strip()
             
             if len(cleaned_result.strip()) < 50:
                 cleaned_result = parsed_result
@@ -240,32 +371,7 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                 # Extract and display budget prominently (same logic as before)
                 st.markdown("---")
                 
-                # Extract cost information
-                cost_patterns = [
-                    r'(?:Total|Project|Budget).*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:total|project|budget)',
-                    r'AUD \$([0-9,]+(?:\.[0-9]{2})?)',
-                    r'([0-9,]+(?:\.[0-9]{2})?)\s*AUD',
-                    r'Total.*?\$([0-9,]+)',
-                    r'([0-9,]+)\s*total'
-                ]
-                
-                material_patterns = [
-                    r'Material.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?material',
-                    r'Materials.*?\$([0-9,]+)',
-                    r'([0-9,]+).*?materials'
-                ]
-                
-                labor_patterns = [
-                    r'Labor.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'Labour.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:labor|labour)',
-                    r'Labor.*?\$([0-9,]+)',
-                    r'([0-9,]+).*?labor'
-                ]
-                
-                # Extract costs
+                # Extract costs (whole AUD)
                 total_cost = None
                 material_cost = None  
                 labor_cost = None
@@ -283,19 +389,19 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                             project_estimate.get('total_project_cost') or
                             0
                         )
-                        total_cost = str(int(float(total_cost_val))) if total_cost_val else None
+                        total_cost = int(float(total_cost_val)) if total_cost_val else None
                         
                         # Extract material costs
                         materials = project_estimate.get('total_material_costs', {})
                         if isinstance(materials, dict) and 'subtotal' in materials:
-                            material_cost = str(int(float(materials['subtotal'])))
+                            material_cost = int(float(materials['subtotal']))
                         
                         # Extract labor costs
                         labor_costs = project_estimate.get('total_labor_costs', {})
                         if isinstance(labor_costs, dict):
                             labor_cost_val = labor_costs.get('average_labor_cost', 0)
                             if labor_cost_val:
-                                labor_cost = str(int(float(labor_cost_val)))
+                                labor_cost = int(float(labor_cost_val))
                         
                         if debug_mode:
                             st.write(f"🔍 **{protocol_mode} Debug:**")
@@ -306,88 +412,44 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                     if debug_mode:
                         st.write(f"🔍 **Debug:** Structured extraction failed: {e}")
                 
-                # Fallback to text extraction
-                if not total_cost:
-                    all_text = cleaned_result
-                    
-                    for pattern in cost_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not total_cost:
-                            total_cost = match.group(1)
-                            break
-                    
-                    for pattern in material_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not material_cost:
-                            material_cost = match.group(1)
-                            break
-                            
-                    for pattern in labor_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not labor_cost:
-                            labor_cost = match.group(1)
-                            break
+                # Fallback to text extraction, only for figures the structured data didn't provide
+                if not (total_cost and material_cost and labor_cost):
+                    text_costs = scan_costs(cleaned_result)
+                    total_cost = total_cost or text_costs.get('total')
+                    material_cost = material_cost or text_costs.get('material')
+                    labor_cost = labor_cost or text_costs.get('labor')
                 
                 # Display budget prominently
                 if total_cost or material_cost or labor_cost:
-                    st.success(f"💰 **ESTIMATED RENOVATION BUDGET** ({protocol_mode.split(' (')[0]})")
-                    
-                    budget_cols = st.columns(3)
-                    
-                    if total_cost:
-                        with budget_cols[0]:
-                            st.metric("💰 Total Project Cost", f"${total_cost} AUD", help="Complete renovation cost including materials, labor, and contingency")
+                    st.success(f"💰 **ESTIMATED RENOVATION BUDGET** ({protocol_label})")
                     
-                    if material_cost:
-                        with budget_cols[1]:
-                            st.metric("🔨 Materials Cost", f"${material_cost} AUD", help="Cost of all renovation materials")
-                    
-                    if labor_cost:
-                        with budget_cols[2]:
-                            st.metric("👷 Labor Cost", f"${labor_cost} AUD", help="Professional installation and labor costs")
+                    render_budget((total_cost, material_cost, labor_cost), EXTRACTED_BUDGET_METRICS)
                     
                     # Protocol-specific info
-                    if "MCP" in protocol_mode:
+                    if is_mcp:
                         st.info("✨ **Enhanced by MCP Protocol:** Improved reliability, standardized communication, and better error handling")
                     
                     # Budget range calculation
                     if total_cost:
-                        try:
-                            cost_num = float(total_cost.replace(',', ''))
-                            budget_low = cost_num * 0.85
-                            budget_high = cost_num * 1.15
-                            st.info(f"💡 **Recommended Budget Range:** ${budget_low:,.0f} - ${budget_high:,.0f} AUD (±15% contingency)")
-                        except:
-                            pass
+                        budget_low = total_cost * 0.85
+                        budget_high = total_cost * 1.15
+                        st.info(f"💡 **Recommended Budget Range:** ${budget_low:,.0f} - ${budget_high:,.0f} AUD (±15% contingency)")
                 else:
                     # Fallback cost estimation
-                    st.info(f"💰 **ESTIMATED RENOVATION BUDGET** ({protocol_mode.split(' (')[0]} - Based on Analysis)")
+                    st.info(f"💰 **ESTIMATED RENOVATION BUDGET** ({protocol_label} - Based on Analysis)")
                     
-                    if cost_grade == "economy":
-                        fallback_total = "18,500"
-                        fallback_materials = "11,000"
-                        fallback_labor = "7,500"
-                    elif cost_grade == "premium":
-                        fallback_total = "35,000"
-                        fallback_materials = "21,000"
-                        fallback_labor = "14,000"
-                    else:
-                        fallback_total = "25,000"
-                        fallback_materials = "15,000"
-                        fallback_labor = "10,000"
+                    fallback_total, fallback_materials, fallback_labor = FALLBACK_BUDGETS.get(cost_grade, FALLBACK_BUDGETS["standard"])
                     
-                    budget_cols = st.columns(3)
-                    with budget_cols[0]:
-                        st.metric("💰 Estimated Total Cost", f"${fallback_total} AUD", help=f"Typical {cost_grade} grade renovation cost")
-                    with budget_cols[1]:
-                        st.metric("🔨 Estimated Materials", f"${fallback_materials} AUD", help="Materials for standard kitchen")
-                    with budget_cols[2]:
-                        st.metric("👷 Estimated Labor", f"${fallback_labor} AUD", help="Professional installation")
+                    render_budget((fallback_total, fallback_materials, fallback_labor), (
+                        ("💰 Estimated Total Cost", f"Typical {cost_grade} grade renovation cost"),
+                        ("🔨 Estimated Materials", "Materials for standard kitchen"),
+                        ("👷 Estimated Labor", "Professional installation"),
+                    ))
                     
                     st.warning("⚠️ These are estimated ranges - see detailed analysis below for specific recommendations")
                 
                 # Display the comprehensive analysis
-                st.markdown(f"### 📋 Comprehensive Kitchen Renovation Analysis ({protocol_mode.split(' (')[0]})")
+                st.markdown(f"### 📋 Comprehensive Kitchen Renovation Analysis ({protocol_label})")
                 st.markdown(cleaned_result)
             
             # Download option
@@ -407,10 +469,10 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             }
             
-            filename_suffix = "mcp" if "MCP" in protocol_mode else "direct"
+            filename_suffix = "mcp" if is_mcp else "direct"
             st.download_button(
-                label=f"📥 Download Analysis Report ({protocol_mode.split(' (')[0]})",
-                data=json.dumps(analysis_data, indent=2),
+                label=f"📥 Download Analysis Report ({protocol_label})",
+                data=dumps_report(analysis_data),
                 file_name=f"kitchen_analysis_{filename_suffix}.json",
                 mime="application/json"
             )
@@ -423,7 +485,7 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
             with st.expander("🔧 Debug Information"):
                 st.text(f"Error details: {str(e)}")
                 try:
-                    arn = get_agent_arn_from_parameter_store(orchestrator_name)
+                    arn = cached_arn(orchestrator_name)
                     st.text(f"{orchestrator_name} ARN: {arn}")
                 except Exception as debug_e:
                     st.text(f"Could not get {orchestrator_name} ARN: {debug_e}")
@@ -478,28 +540,24 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("### 🤖 Agent Status")
 
 # Check orchestrator status based on protocol
-orchestrator_to_check = "mcp_orchestrator_agent" if "MCP" in protocol_mode else "orchestrator_agent"
+orchestrator_to_check = "mcp_orchestrator_agent" if is_mcp else "orchestrator_agent"
+
+# Orchestrator and sub-agent ARNs are fetched in a single request
+agent_arns, agent_errors = cached_agent_status((orchestrator_to_check, "langgraph_agent", "crewai_agent"))
 
-try:
-    orchestrator_arn = get_agent_arn_from_parameter_store(orchestrator_to_check)
+if orchestrator_to_check in agent_arns:
     st.sidebar.success(f"✅ {orchestrator_to_check.replace('_', ' ').title()}: Ready")
-    st.sidebar.text(f"ARN: ...{orchestrator_arn[-20:]}")
-except Exception as e:
+    st.sidebar.text(f"ARN: ...{agent_arns[orchestrator_to_check][-20:]}")
+else:
     st.sidebar.error(f"❌ {orchestrator_to_check.replace('_', ' ').title()}: Not available")
-    st.sidebar.text(f"Error: {str(e)}")
+    st.sidebar.text(f"Error: {agent_errors.get(orchestrator_to_check)}")
 
 # Check sub-agents status
-try:
-    langgraph_arn = get_agent_arn_from_parameter_store("langgraph_agent")
-    st.sidebar.success("✅ LangGraph Agent: Ready")
-except:
-    st.sidebar.error("❌ LangGraph Agent: Not available")
-
-try:
-    crewai_arn = get_agent_arn_from_parameter_store("crewai_agent")
-    st.sidebar.success("✅ CrewAI Agent: Ready")
-except:
-    st.sidebar.error("❌ CrewAI Agent: Not available")
+for agent_name, label in (("langgraph_agent", "LangGraph Agent"), ("crewai_agent", "CrewAI Agent")):
+    if agent_name in agent_arns:
+        st.sidebar.success(f"✅ {label}: Ready")
+    else:
+        st.sidebar.error(f"❌ {label}: Not available")
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 💡 Tips")
@@ -526,7 +584,7 @@ timing_text = """
 - 📋 Final synthesis: ~4s
 
 Watch the workflow above!
-""" if "MCP" in protocol_mode else """
+""" if is_mcp else """
 **Direct Analysis takes 25-30 seconds:**
 - 🎯 Orchestrator planning: ~3s
 - 🏠 LangGraph analysis: ~15s  
@@ -556,7 +614,7 @@ st.markdown("---")
 st.markdown(f"""
 <div style='text-align: center'>
 <p><strong>🎯 Multi-Agent Kitchen Renovation System</strong></p>
-<p>Powered by Amazon Bedrock AgentCore | {protocol_mode.split(' (')[0]} Protocol</p>
+<p>Powered by Amazon Bedrock AgentCore | {protocol_label} Protocol</p>
 <p>LangGraph + CrewAI + Strands Architecture</p>
 </div>
 """, unsafe_allow_html=True)
@@ -3,16 +3,366 @@ Streamlit UI for Kitchen Renovation Cost Estimator using the Orchestrator Agent
 """
 
 import streamlit as st
+import hashlib
 import json
 import os
+import queue
+import re
 import sys
-from PIL import Image
+import time
 import tempfile
-import boto3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(__file__))
-from utils import get_agent_arn_from_parameter_store, invoke_agent_with_boto3
+from json_utils import dumps_report, loads_json
+from utils import get_agent_arn_from_parameter_store, get_agent_arns_from_parameter_store, get_agentcore_client, invoke_agent_with_boto3_stream
+
+# Typical response sizes in characters, used to estimate streaming progress
+EXPECTED_RESPONSE_CHARS = {"langgraph_agent": 8000, "crewai_agent": 12000}
+
+AGENT_NAMES = ("orchestrator_agent", "langgraph_agent", "crewai_agent")
+
+# Keys CrewAI has used for the project total, in order of preference
+TOTAL_COST_KEYS = ('final_total_AUD', 'final_project_total_AUD', 'final_project_total', 'total_project_cost')
+
+# Response parsing patterns, compiled once at import instead of on every click
+_THINKING_RE = re.compile(r'<thinking>.*?</thinking>', re.DOTALL)
+_EXEC_RE = re.compile(r'\[Executing:.*?\]')
+_BLANKS_RE = re.compile(r'\n{3,}')
+
+_COST_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:Total|Project|Budget).*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
+    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:total|project|budget)',
+    r'AUD \$([0-9,]+(?:\.[0-9]{2})?)',
+    r'([0-9,]+(?:\.[0-9]{2})?)\s*AUD',
+    r'Total.*?\$([0-9,]+)',
+    r'([0-9,]+)\s*total'
+)]
+
+_MATERIAL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Material.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
+    r'\$([0-9,]+(?:\.[0-9]{2})?).*?material',
+    r'Materials.*?\$([0-9,]+)',
+    r'([0-9,]+).*?materials'
+)]
+
+_LABOR_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Labor.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
+    r'Labour.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
+    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:labor|labour)',
+    r'Labor.*?\$([0-9,]+)',
+    r'([0-9,]+).*?labor'
+)]
+
+
+def first_value(data: dict, keys) -> Any:
+    """Return the first truthy value among the given keys, or None"""
+    return next((data[key] for key in keys if data.get(key)), None)
+
+
+def first_match(patterns, sources) -> Optional[str]:
+    """
+    Return the first captured amount, trying each pattern in order against every source
+    
+    Sources are searched one by one rather than joined into a single string.
+    """
+    for pattern in patterns:
+        for source in sources:
+            match = pattern.search(source)
+            if match:
+                return match.group(1)
+    return None
+
+
+def truncate(text: str, limit: int = 1000) -> str:
+    """Shorten text for display, marking the cut with an ellipsis"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@st.cache_resource
+def get_bedrock_client():
+    """Shared bedrock-runtime client for the report formatting call, kept across reruns"""
+    import boto3
+
+    return boto3.client('bedrock-runtime', region_name='us-west-2')
+
+
+@st.cache_data(ttl=300)
+def cached_agent_status(names: Tuple[str, ...]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Agent ARN lookups in one batched GetParameters call, cached for 5 minutes
+    
+    Returns (arns, errors), both keyed by agent name.
+    """
+    try:
+        arns = get_agent_arns_from_parameter_store(list(names))
+    except Exception as e:
+        return {}, {name: str(e) for name in names}
+    errors = {name: "Parameter not found" for name in names if name not in arns}
+    return arns, errors
+
+
+@st.cache_data(ttl=3600)
+def cached_arn(name: str) -> str:
+    """Parameter Store ARN lookup, cached for an hour (ARNs only change on redeploy)"""
+    # Served from the sidebar's batched lookup when possible
+    arns, _ = cached_agent_status(AGENT_NAMES)
+    if name in arns:
+        return arns[name]
+    return get_agent_arn_from_parameter_store(name)
+
+
+# Agent responses are reused for an hour when the same query is sent again
+AGENT_CACHE_TTL = 3600
+AGENT_CACHE_MAX_ENTRIES = 128
+
+
+class AgentResponseCache:
+    """
+    Bounded TTL map of (agent_name, query) -> response, shared across sessions
+    
+    Entries are kept in insertion order, so expired and surplus entries are
+    pruned from the front on every write. Workers write from pool threads,
+    hence the lock.
+    """
+    
+    def __init__(self, ttl: float = AGENT_CACHE_TTL, max_entries: int = AGENT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        return None
+    
+    def put(self, key: Tuple[str, str], response: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now, response)
+            for oldest, (stored_at, _) in list(self._entries.items()):
+                if len(self._entries) <= self.max_entries and now - stored_at < self.ttl:
+                    break
+                del self._entries[oldest]
+
+
+@st.cache_resource
+def agent_response_cache() -> AgentResponseCache:
+    """Agent response cache, shared across reruns and sessions"""
+    return AgentResponseCache()
+
+
+@st.cache_data(ttl=AGENT_CACHE_TTL, show_spinner=False)
+def format_report_with_llm(raw_analysis: str) -> str:
+    """
+    Clean up and format the combined analysis with Nova Premier
+    
+    Cached on the raw text, so an identical analysis isn't reformatted.
+    """
+    format_prompt = f"""
+Please clean up and properly format this kitchen renovation analysis. The text contains formatting artifacts and escaped characters that need to be fixed.
+
+<raw_analysis>
+{raw_analysis}
+</raw_analysis>
+
+Please:
+1. Fix all formatting issues (broken tables, escaped characters, weird symbols)
+2. Create clean, readable markdown with proper headers
+3. Ensure cost tables display correctly with aligned columns
+4. Remove any garbled text or artifacts
+5. Maintain all the important information (costs, recommendations, timeline)
+6. Format as a professional renovation analysis report
+
+Return only the cleaned, well-formatted analysis - no explanations.
+"""
+    
+    response = get_bedrock_client().converse(
+        modelId="us.amazon.nova-premier-v1:0",
+        messages=[{
+            "role": "user",
+            "content": [{"text": format_prompt}]
+        }],
+        inferenceConfig={
+            "maxTokens": 4000,
+            "temperature": 0.1
+        }
+    )
+    
+    return response['output']['message']['content'][0]['text'].strip()
+
+
+def render_report_markdown(langgraph_data: dict, crewai_data: dict, cost_grade: str) -> str:
+    """
+    Build the final markdown report straight from the agents' structured results
+    
+    Used instead of an LLM formatting pass when both agents returned JSON.
+    """
+    project_estimate = crewai_data.get('project_estimate', crewai_data)
+    total = first_value(project_estimate, TOTAL_COST_KEYS)
+    materials_cost = project_estimate.get('total_material_costs', project_estimate.get('total_material_cost'))
+    if isinstance(materials_cost, dict):
+        materials_cost = materials_cost.get('subtotal')
+    labor_cost = project_estimate.get('total_labor_costs', project_estimate.get('total_labor_cost'))
+    if isinstance(labor_cost, dict):
+        labor_cost = labor_cost.get('average_labor_cost') or labor_cost.get('total_labor_cost') or labor_cost.get('subtotal')
+    
+    lines = [f"## 🏠 Kitchen Renovation Analysis ({cost_grade.title()} Grade)", ""]
+    
+    detected_objects = langgraph_data.get('detected_objects', [])
+    if detected_objects:
+        lines += ["### 🔍 Detected Kitchen Objects", "", "| Object | Confidence |", "|---|---|"]
+        lines += [f"| {obj.get('name', '-')} | {obj.get('confidence', '-')} |" for obj in detected_objects]
+        lines.append("")
+    
+    materials = langgraph_data.get('materials', [])
+    if materials:
+        lines += ["### 🧱 Materials", "", "| Material | Area (m²) | Location |", "|---|---|---|"]
+        lines += [f"| {m.get('material_type', '-')} | {m.get('area_sqm', '-')} | {m.get('location', '-')} |" for m in materials]
+        lines.append("")
+    
+    lines += ["### 💰 Cost Estimate", "", "| Item | Cost (AUD) |", "|---|---|"]
+    for label, value in (("Materials", materials_cost), ("Labor", labor_cost), ("**Total Project Cost**", total)):
+        if isinstance(value, (int, float)):
+            lines.append(f"| {label} | ${value:,.0f} |")
+    lines.append("")
+    
+    recommendations = crewai_data.get('recommendations', [])
+    if recommendations:
+        lines += ["### 📋 Recommendations", ""]
+        lines += [f"- {rec}" for rec in recommendations]
+    
+    return "\n".join(lines)
+
+
+def parse_agent_json(response: str) -> Any:
+    """
+    Parse an agent's JSON response, unwrapping it if it was JSON-encoded twice
+    
+    Raises json.JSONDecodeError when the response isn't JSON.
+    """
+    response = response.strip()
+    # A double-encoded payload is a JSON string literal wrapping the real document
+    if response.startswith('"'):
+        response = loads_json(response)
+    return loads_json(response) if isinstance(response, str) else response
+
+
+def build_crewai_query(cost_grade: str, materials_data: list) -> str:
+    """
+    Build the CrewAI cost estimation prompt, using LangGraph's materials when available
+    """
+    if materials_data:
+        return f"Estimate costs for kitchen renovation with {cost_grade} grade materials. Materials: {json.dumps(materials_data)}"
+    return f"Estimate costs for kitchen renovation with {cost_grade} grade materials including cabinets, countertops, and flooring"
+
+
+def submit_agent(pool: ThreadPoolExecutor, agent_name: str, query: str) -> Tuple[Future, queue.SimpleQueue]:
+    """
+    Start a streaming agent invocation on the worker pool
+    
+    Response lines are put on the returned queue as they arrive and the future
+    resolves to the full response text. ARN lookup failures are returned as a
+    failed future, so they surface from future.result() like invocation errors.
+    """
+    chunks = queue.SimpleQueue()
+    cache = agent_response_cache()
+    cached = cache.get((agent_name, query))
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future, chunks
+    try:
+        agent_arn = cached_arn(agent_name)
+    except Exception as e:
+        future = Future()
+        future.set_exception(e)
+        return future, chunks
+    # Fetched here on the script thread so workers never build the client concurrently
+    client = get_agentcore_client()
+    
+    def invoke() -> str:
+        lines = []
+        for line in invoke_agent_with_boto3_stream(agent_arn, query, client=client):
+            # Failures arrive as an error line, possibly after partial output - raise
+            # rather than caching the truncated response
+            if line.startswith("Error:"):
+                raise RuntimeError(line[len("Error:"):].strip())
+            lines.append(line)
+            chunks.put(line)
+        response = '\n'.join(lines)
+        cache.put((agent_name, query), response)
+        return response
+    
+    return pool.submit(invoke), chunks
+
+
+def wait_streaming(future: Future, chunks: queue.SimpleQueue, placeholder,
+                   progress_bar=None, progress_span: Tuple[int, int] = (0, 100),
+                   expected_chars: int = 8000, progress_text: str = "") -> str:
+    """
+    Show an agent's response in a placeholder while it streams in and return the full text
+    
+    Streamlit elements can only be updated from the script thread, so the
+    worker hands lines over through the queue. When a progress bar is given it
+    advances across progress_span in proportion to the characters received,
+    relative to the agent's typical response size.
+    """
+    start, end = progress_span
+    received = []
+    received_chars = 0
+    while not (future.done() and chunks.empty()):
+        try:
+            line = chunks.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        received.append(line)
+        received_chars += len(line)
+        placeholder.text('\n'.join(received)[-2000:])
+        if progress_bar is not None:
+            fraction = min(0.99, received_chars / expected_chars)
+            progress_bar.progress(int(start + (end - start) * fraction), text=progress_text)
+    placeholder.empty()
+    if progress_bar is not None:
+        progress_bar.progress(end, text=progress_text)
+    return future.result()
+
+
+def agent_status_panel():
+    """Agent readiness indicators for the sidebar"""
+    # All agent ARNs are fetched in a single request
+    agent_arns, agent_errors = cached_agent_status(AGENT_NAMES)
+    
+    # Check orchestrator status
+    if "orchestrator_agent" in agent_arns:
+        st.success("✅ Orchestrator Agent: Ready")
+        st.text(f"ARN: ...{agent_arns['orchestrator_agent'][-20:]}")
+    else:
+        st.error("❌ Orchestrator Agent: Not available")
+        st.text(f"Error: {agent_errors.get('orchestrator_agent')}")
+    
+    # Check sub-agents status
+    for agent_name, label in (("langgraph_agent", "LangGraph Agent"), ("crewai_agent", "CrewAI Agent")):
+        if agent_name in agent_arns:
+            st.success(f"✅ {label}: Ready")
+        else:
+            st.error(f"❌ {label}: Not available")
+
+
+# On Streamlit versions with fragments the status panel refreshes itself every
+# minute without rerunning the page; older versions render it with the page
+if hasattr(st, "fragment"):
+    render_agent_status = st.fragment(run_every="60s")(agent_status_panel)
+else:
+    render_agent_status = agent_status_panel
+
 
 # Page configuration
 st.set_page_config(
@@ -39,10 +389,7 @@ include_labor = st.sidebar.checkbox("Include Labor Costs", value=True)
 
 # Debug mode toggle
 debug_mode = st.sidebar.checkbox("🔧 Debug Mode", value=False, help="Show cost extraction details for troubleshooting")
-if debug_mode:
-    st.session_state['debug_mode'] = True
-else:
-    st.session_state['debug_mode'] = False
+st.session_state['debug_mode'] = debug_mode
 
 # Main interface
 st.header("🎯 Multi-Agent Kitchen Analysis")
@@ -71,9 +418,15 @@ elif input_method == "Upload Image":
     )
     
     if uploaded_file is not None:
-        # Display the uploaded image
-        image = Image.open(uploaded_file)
-        st.image(image, caption="Uploaded Kitchen Image", use_container_width=True)
+        # Display the uploaded image, decoding it only when a different file is uploaded
+        image_hash = hashlib.md5(uploaded_file.getvalue()).hexdigest()
+        if st.session_state.get('kitchen_image_hash') != image_hash:
+            from PIL import Image
+            image = Image.open(uploaded_file)
+            image.load()
+            st.session_state['kitchen_image'] = image
+            st.session_state['kitchen_image_hash'] = image_hash
+        st.image(st.session_state['kitchen_image'], caption="Uploaded Kitchen Image", use_container_width=True)
         
         user_query = f"I've uploaded a kitchen image. Please analyze this kitchen for renovation planning with {cost_grade} grade materials. Include labor costs: {include_labor}. Provide detailed cost estimates in Australian dollars."
 
@@ -107,42 +460,51 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
         with thinking_container:
             thinking_header = st.empty()
             thinking_content = st.empty()
+            stream_preview = st.empty()
         
         try:
             # Get orchestrator agent ARN
-            orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
+            orchestrator_arn = cached_arn("orchestrator_agent")
             
             # Multi-step agent workflow
             thinking_header.markdown("#### 🤖 Multi-Agent Workflow:")
             
             # Start timer
-            import time
             start_time = time.time()
             
             # Initialize variables
             materials_data = []
             langgraph_result = ""
             crewai_result = ""
+            langgraph_data = None
             crewai_data = None
             
+            # boto3 calls block, so the agents run on worker threads. For text
+            # descriptions CrewAI's prompt doesn't need LangGraph's materials and both
+            # agents start together; image analyses still feed materials to CrewAI.
+            run_in_parallel = input_method == "Text Description"
+            agent_pool = ThreadPoolExecutor(max_workers=2)
+            langgraph_query = f"Analyze kitchen for renovation planning with {cost_grade} grade materials"
+            langgraph_future, langgraph_chunks = submit_agent(agent_pool, "langgraph_agent", langgraph_query)
+            crewai_future = None
+            if run_in_parallel:
+                crewai_future, crewai_chunks = submit_agent(agent_pool, "crewai_agent", build_crewai_query(cost_grade, []))
+            
             # Step 1: LangGraph Agent - Kitchen Analysis
             progress_bar.progress(20, text="🏠 Step 1: LangGraph analyzing kitchen...")
             thinking_content.text("🔍 **STEP 1: LangGraph Agent** - Analyzing kitchen layout and materials...")
             
             with st.spinner("🔄 LangGraph Agent working... (30s expected)"):
                 try:
-                    langgraph_arn = get_agent_arn_from_parameter_store("langgraph_agent")
-                    langgraph_query = f"Analyze kitchen for renovation planning with {cost_grade} grade materials"
-                    langgraph_result = invoke_agent_with_boto3(langgraph_arn, langgraph_query)
+                    langgraph_result = wait_streaming(
+                        langgraph_future, langgraph_chunks, stream_preview,
+                        progress_bar, (20, 60), EXPECTED_RESPONSE_CHARS["langgraph_agent"],
+                        "🏠 Step 1: LangGraph analyzing kitchen..."
+                    )
                     
                     # Parse LangGraph JSON response
                     try:
-                        import json
-                        langgraph_data = json.loads(langgraph_result)
-                        
-                        # Handle double-encoded JSON
-                        if isinstance(langgraph_data, str):
-                            langgraph_data = json.loads(langgraph_data)
+                        langgraph_data = parse_agent_json(langgraph_result)
                         
                         materials_data = langgraph_data.get('materials', [])
                         
@@ -159,7 +521,7 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                         thinking_content.warning("⚠️ LangGraph returned non-JSON response")
                         materials_data = []
                         with st.expander("🔍 **LangGraph Agent Results** - Raw Response", expanded=False):
-                            st.text(langgraph_result[:1000] + "..." if len(langgraph_result) > 1000 else langgraph_result)
+                            st.text(truncate(langgraph_result))
                         
                 except Exception as e:
                     thinking_content.error(f"❌ LangGraph failed: {str(e)}")
@@ -171,33 +533,26 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
             thinking_content.text("💰 **STEP 2: CrewAI Agent** - Multi-agent cost estimation team (Materials Expert + Labor Analyst + Cost Synthesizer)...")
             
             # Show materials data being passed to CrewAI
-            if materials_data:
+            if materials_data and not run_in_parallel:
                 thinking_content.text(f"💰 **CrewAI Input:** Using {len(materials_data)} materials from LangGraph for cost analysis...")
             
             with st.spinner("🔄 CrewAI Agent working... (15s expected)"):
                 try:
-                    crewai_arn = get_agent_arn_from_parameter_store("crewai_agent")
-                    
-                    # Create materials prompt for CrewAI
-                    if materials_data:
-                        crewai_query = f"Estimate costs for kitchen renovation with {cost_grade} grade materials. Materials: {json.dumps(materials_data)}"
-                    else:
-                        crewai_query = f"Estimate costs for kitchen renovation with {cost_grade} grade materials including cabinets, countertops, and flooring"
-                    
-                    crewai_result = invoke_agent_with_boto3(crewai_arn, crewai_query)
+                    # Started alongside LangGraph for text descriptions, otherwise now with its materials
+                    if crewai_future is None:
+                        crewai_future, crewai_chunks = submit_agent(agent_pool, "crewai_agent", build_crewai_query(cost_grade, materials_data))
+                    crewai_result = wait_streaming(
+                        crewai_future, crewai_chunks, stream_preview,
+                        progress_bar, (60, 90), EXPECTED_RESPONSE_CHARS["crewai_agent"],
+                        "💰 Step 2: CrewAI estimating costs..."
+                    )
                     
                     # Parse CrewAI response
                     try:
-                        crewai_data = json.loads(crewai_result)
-                        
-                        # Handle double-encoded JSON
-                        if isinstance(crewai_data, str):
-                            crewai_data = json.loads(crewai_data)
+                        crewai_data = parse_agent_json(crewai_result)
                         
                         # Extract total cost for display (handle all naming conventions including _AUD suffix)
-                        total_cost_raw = (crewai_data.get('final_project_total_AUD', 0) or 
-                                        crewai_data.get('final_project_total', 0) or 
-                                        crewai_data.get('total_project_cost', 0))
+                        total_cost_raw = first_value(crewai_data, TOTAL_COST_KEYS[1:]) or 0
                         
                         thinking_content.success(f"✅ **CrewAI Complete:** Estimated total cost: ${total_cost_raw:,.0f} AUD")
                         
@@ -205,7 +560,7 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                         st.session_state['crewai_data'] = crewai_data
                         
                         # Debug: Show what we're storing (only in debug mode)
-                        if st.session_state.get('debug_mode', False):
+                        if debug_mode:
                             st.write(f"🔍 **Storing CrewAI data:** Keys = {list(crewai_data.keys())}")
                             st.write(f"🔍 **Sample values:** final_project_total_AUD = {crewai_data.get('final_project_total_AUD', 'NOT FOUND')}")
                             st.write(f"🔍 **Sample values:** final_project_total = {crewai_data.get('final_project_total', 'NOT FOUND')}")
@@ -218,12 +573,14 @@ if st.button("🚀 Run Multi-Agent Analysis", type="primary", disabled=not user_
                     except json.JSONDecodeError:
                         thinking_content.warning("⚠️ CrewAI returned non-JSON response")
                         with st.expander("💰 **CrewAI Agent Results** - Raw Response", expanded=False):
-                            st.text(crewai_result[:1000] + "..." if len(crewai_result) > 1000 else crewai_result)
+                            st.text(truncate(crewai_result))
                         
                 except Exception as e:
                     thinking_content.error(f"❌ CrewAI failed: {str(e)}")
                     crewai_result = f"Error: {str(e)}"
             
+            agent_pool.shutdown(wait=False)
+            
             # Step 3: Quick Synthesis (no long orchestrator call)
             progress_bar.progress(90, text="📋 Step 3: Generating final report...")
             thinking_content.text("🎯 **STEP 3: Final Report** - Combining agent results...")
@@ -247,8 +604,6 @@ The kitchen renovation plan combines object detection results with detailed cost
             thinking_content.success(f"✅ **All Agents Complete!** Total time: {elapsed:.1f}s")
             
             # Parse and clean the streaming response
-            import re
-            
             # Handle streaming format from orchestrator
             if isinstance(result, str) and 'data: ' in result:
                 lines = result.split('\n')
@@ -265,86 +620,34 @@ The kitchen renovation plan combines object detection results with detailed cost
                 parsed_result = str(result)
             
             # Clean up the response (remove thinking tags, execution logs)
-            cleaned_result = re.sub(r'<thinking>.*?</thinking>', '', parsed_result, flags=re.DOTALL)
-            cleaned_result = re.sub(r'\[Executing:.*?\]', '', cleaned_result)
-            cleaned_result = re.sub(r'\n{3,}', '\n\n', cleaned_result).strip()
+            cleaned_result = _THINKING_RE.sub('', parsed_result)
+            cleaned_result = _EXEC_RE.sub('', cleaned_result)
+            cleaned_result = _BLANKS_RE.sub('\n\n', cleaned_result).strip()
             
             # If cleaned result is too short or empty, use original result
             if len(cleaned_result.strip()) < 50:
                 cleaned_result = parsed_result
             
-            # Use LLM to clean up and format the final analysis properly
-            try:
-                thinking_content.text("🤖 **Final Step:** Cleaning and formatting analysis with LLM...")
-                
-                bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
-                
-                format_prompt = f"""
-Please clean up and properly format this kitchen renovation analysis. The text contains formatting artifacts and escaped characters that need to be fixed.
-
-<raw_analysis>
-{cleaned_result}
-</raw_analysis>
-
-Please:
-1. Fix all formatting issues (broken tables, escaped characters, weird symbols)
-2. Create clean, readable markdown with proper headers
-3. Ensure cost tables display correctly with aligned columns
-4. Remove any garbled text or artifacts
-5. Maintain all the important information (costs, recommendations, timeline)
-6. Format as a professional renovation analysis report
-
-Return only the cleaned, well-formatted analysis - no explanations.
-"""
-                
-                response = bedrock.converse(
-                    modelId="us.amazon.nova-premier-v1:0",
-                    messages=[{
-                        "role": "user",
-                        "content": [{"text": format_prompt}]
-                    }],
-                    inferenceConfig={
-                        "maxTokens": 4000,
-                        "temperature": 0.1
-                    }
-                )
-                
-                cleaned_result = response['output']['message']['content'][0]['text'].strip()
+            # Both agents returned structured data - render the report directly
+            if isinstance(langgraph_data, dict) and isinstance(crewai_data, dict):
+                cleaned_result = render_report_markdown(langgraph_data, crewai_data, cost_grade)
                 thinking_content.success("✅ **Analysis formatted successfully!**")
-                
-            except Exception as e:
-                thinking_content.warning(f"⚠️ LLM formatting failed: {e} - showing original result")
-                pass
+            
+            # Otherwise use LLM to clean up and format the final analysis properly
+            else:
+                try:
+                    thinking_content.text("🤖 **Final Step:** Cleaning and formatting analysis with LLM...")
+                    cleaned_result = format_report_with_llm(cleaned_result)
+                    thinking_content.success("✅ **Analysis formatted successfully!**")
+                    
+                except Exception as e:
+                    thinking_content.warning(f"⚠️ LLM formatting failed: {e} - showing original result")
+                    pass
             
             with result_container:
                 # Extract and display budget prominently
                 st.markdown("---")
                 
-                # Extract cost information using multiple patterns
-                cost_patterns = [
-                    r'(?:Total|Project|Budget).*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:total|project|budget)',
-                    r'AUD \$([0-9,]+(?:\.[0-9]{2})?)',
-                    r'([0-9,]+(?:\.[0-9]{2})?)\s*AUD',
-                    r'Total.*?\$([0-9,]+)',
-                    r'([0-9,]+)\s*total'
-                ]
-                
-                material_patterns = [
-                    r'Material.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?material',
-                    r'Materials.*?\$([0-9,]+)',
-                    r'([0-9,]+).*?materials'
-                ]
-                
-                labor_patterns = [
-                    r'Labor.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'Labour.*?Cost.*?[:\-\s]*\$?([0-9,]+(?:\.[0-9]{2})?)',
-                    r'\$([0-9,]+(?:\.[0-9]{2})?).*?(?:labor|labour)',
-                    r'Labor.*?\$([0-9,]+)',
-                    r'([0-9,]+).*?labor'
-                ]
-                
                 # Extract costs from individual agent results
                 total_cost = None
                 material_cost = None  
@@ -365,13 +668,8 @@ Return only the cleaned, well-formatted analysis - no explanations.
                         
                         # Extract total cost from multiple possible locations
                         total_cost_val = (
-                            project_estimate.get('final_total_AUD') or
-                            project_estimate.get('final_project_total_AUD') or
-                            project_estimate.get('final_project_total') or 
-                            project_estimate.get('total_project_cost') or
-                            crew_data.get('final_project_total_AUD') or
-                            crew_data.get('final_project_total') or
-                            crew_data.get('total_project_cost') or
+                            first_value(project_estimate, TOTAL_COST_KEYS) or
+                            first_value(crew_data, TOTAL_COST_KEYS[1:]) or
                             0
                         )
                         total_cost = str(int(float(total_cost_val))) if total_cost_val else None
@@ -405,7 +703,7 @@ Return only the cleaned, well-formatted analysis - no explanations.
                         labor_cost = str(int(float(labor_cost_val))) if labor_cost_val else None
                             
                         # Debug information (show if debug mode is enabled)
-                        if st.session_state.get('debug_mode', False):
+                        if debug_mode:
                             st.write(f"🔍 **Debug Cost Extraction:**")
                             st.write(f"- Found crew_data: {'YES' if crew_data else 'NO'}")
                             if crew_data:
@@ -429,25 +727,10 @@ Return only the cleaned, well-formatted analysis - no explanations.
                 
                 # Fallback to text extraction from all results
                 if not total_cost:
-                    all_text = f"{langgraph_result} {crewai_result} {cleaned_result}"
-                    
-                    for pattern in cost_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not total_cost:
-                            total_cost = match.group(1)
-                            break
-                    
-                    for pattern in material_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not material_cost:
-                            material_cost = match.group(1)
-                            break
-                            
-                    for pattern in labor_patterns:
-                        match = re.search(pattern, all_text, re.IGNORECASE)
-                        if match and not labor_cost:
-                            labor_cost = match.group(1)
-                            break
+                    sources = (langgraph_result, crewai_result, cleaned_result)
+                    total_cost = first_match(_COST_PATTERNS, sources)
+                    material_cost = material_cost or first_match(_MATERIAL_PATTERNS, sources)
+                    labor_cost = labor_cost or first_match(_LABOR_PATTERNS, sources)
                 
                 # Display budget prominently
                 if total_cost or material_cost or labor_cost:
@@ -529,7 +812,7 @@ Return only the cleaned, well-formatted analysis - no explanations.
             
             st.download_button(
                 label="📥 Download Analysis Report",
-                data=json.dumps(analysis_data, indent=2),
+                data=dumps_report(analysis_data),
                 file_name=f"multi_agent_kitchen_analysis.json",
                 mime="application/json"
             )
@@ -542,7 +825,7 @@ Return only the cleaned, well-formatted analysis - no explanations.
             with st.expander("🔧 Debug Information"):
                 st.text(f"Error details: {str(e)}")
                 try:
-                    orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
+                    orchestrator_arn = cached_arn("orchestrator_agent")
                     st.text(f"Orchestrator ARN: {orchestrator_arn}")
                 except Exception as debug_e:
                     st.text(f"Could not get orchestrator ARN: {debug_e}")
@@ -595,27 +878,8 @@ with col2:
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 🤖 Agent Status")
 
-# Check orchestrator status
-try:
-    orchestrator_arn = get_agent_arn_from_parameter_store("orchestrator_agent")
-    st.sidebar.success("✅ Orchestrator Agent: Ready")
-    st.sidebar.text(f"ARN: ...{orchestrator_arn[-20:]}")
-except Exception as e:
-    st.sidebar.error("❌ Orchestrator Agent: Not available")
-    st.sidebar.text(f"Error: {str(e)}")
-
-# Check sub-agents status
-try:
-    langgraph_arn = get_agent_arn_from_parameter_store("langgraph_agent")
-    st.sidebar.success("✅ LangGraph Agent: Ready")
-except:
-    st.sidebar.error("❌ LangGraph Agent: Not available")
-
-try:
-    crewai_arn = get_agent_arn_from_parameter_store("crewai_agent")
-    st.sidebar.success("✅ CrewAI Agent: Ready")
-except:
-    st.sidebar.error("❌ CrewAI Agent: Not available")
+with st.sidebar:
+    render_agent_status()
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 💡 Tips")
@@ -5,7 +5,8 @@ Test deployed agent
 
 import boto3
 import json
-from utils import invoke_agent_with_boto3, get_agent_arn_from_parameter_store
+import sys
+from utils import invoke_agent_with_boto3_stream, get_agent_arn_from_parameter_store
 
 
 def test_langgraph_agent():
@@ -16,11 +17,11 @@ def test_langgraph_agent():
         agent_arn = get_agent_arn_from_parameter_store("langgraph_agent")
         print(f"Testing agent: {agent_arn}")
         
-        # Test the agent using our fixed utility function
-        result = invoke_agent_with_boto3(agent_arn, "Analyze a kitchen for renovation planning")
-        
+        # Print the response as it streams in instead of waiting for the full body
         print("✅ Agent response:")
-        print(result)
+        for line in invoke_agent_with_boto3_stream(agent_arn, "Analyze a kitchen for renovation planning"):
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
         return True
         
     except Exception as e:
@@ -6,7 +6,6 @@ Tests the full kitchen renovation workflow using Model Context Protocol
 
 import asyncio
 import sys
-import base64
 import json
 import logging
 from pathlib import Path
@@ -18,8 +17,10 @@ logger = logging.getLogger(__name__)
 # Add MCP base to path
 sys.path.append('mcp_base')
 from mcp_base.mcp_client_utils import AgentCoreMCPClient
+from utils import image_arguments
 
-async def test_complete_workflow():
+
+async def test_complete_workflow(client: AgentCoreMCPClient):
     """Test the complete MCP workflow with a kitchen image"""
     
     print("🚀 Starting Complete MCP Workflow Test")
@@ -29,18 +30,17 @@ async def test_complete_workflow():
     print("🔗 Protocol: Model Context Protocol (MCP)")
     print("")
     
-    # Initialize MCP client
-    client = AgentCoreMCPClient()
-    
     # Load and encode the image
     image_path = "/Users/totrinh/Library/CloudStorage/OneDrive-amazon.com/workspace/agent-assemble/TechSummit_2025/sample_images/img_1.jpg"
     print(f"📸 Loading image: {Path(image_path).name}")
     
     try:
-        with open(image_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
-        print("✅ Image loaded and encoded")
-        print(f"   Image size: {len(image_data)} characters (base64)")
+        image_kwargs = image_arguments(image_path)
+        if 'image_s3_uri' in image_kwargs:
+            print(f"✅ Image uploaded: {image_kwargs['image_s3_uri']}")
+        else:
+            print("✅ Image loaded and encoded")
+            print(f"   Image size: {len(image_kwargs['image_data'])} characters (base64)")
     except Exception as e:
         print(f"❌ Failed to load image: {e}")
         return False
@@ -64,7 +64,7 @@ async def test_complete_workflow():
     workflow_result = await client.invoke_agent_tool(
         'orchestrator_agent',
         'analyze_kitchen_renovation',
-        image_data=image_data,
+        **image_kwargs,
         renovation_goals='Modern kitchen upgrade with smart appliances',
         budget_range='50000-100000'
     )
@@ -127,7 +127,9 @@ async def test_complete_workflow():
 
 async def main():
     """Main test function"""
-    success = await test_complete_workflow()
+    # One client for the whole run so every tool call shares the same keep-alive connection pool
+    async with AgentCoreMCPClient() as client:
+        success = await test_complete_workflow(client)
     
     print("\n" + "=" * 60)
     print("🎯 MCP WORKFLOW TEST COMPLETE!")
@@ -5,34 +5,32 @@ Final test of the working MCP system with real data
 
 import asyncio
 import sys
-import base64
-import json
 from pathlib import Path
 
 # Add MCP base to path
 sys.path.append('mcp_base')
 from mcp_base.mcp_client_utils import AgentCoreMCPClient
+from json_utils import loads_json
+from utils import image_arguments
 
-async def test_working_system():
+
+async def test_working_system(client: AgentCoreMCPClient):
     """Test the complete working MCP system with simplified agents"""
     
     print("🎉 TESTING THE WORKING MCP SYSTEM WITH REAL DATA")
     print("=" * 60)
     print("")
     
-    client = AgentCoreMCPClient()
-    
     # Load image
     image_path = "/Users/totrinh/Library/CloudStorage/OneDrive-amazon.com/workspace/agent-assemble/TechSummit_2025/sample_images/img_1.jpg"
-    with open(image_path, 'rb') as f:
-        image_data = base64.b64encode(f.read()).decode('utf-8')
+    image_kwargs = image_arguments(image_path)
     
     print("🔄 Testing the complete working MCP workflow...")
     
     result = await client.invoke_agent_tool(
         'orchestrator_agent',
         'orchestrate_renovation_workflow',
-        image_data=image_data,
+        **image_kwargs,
         renovation_goals='Modern kitchen with granite countertops and energy-efficient appliances',
         budget_range='75000'
     )
@@ -43,8 +41,8 @@ async def test_working_system():
         raw_result = result.get('result', {})
         
         try:
-            if isinstance(raw_result, str):
-                parsed = json.loads(raw_result)
+            if isinstance(raw_result, (str, bytes)):
+                parsed = loads_json(raw_result)
             else:
                 parsed = raw_result
             
@@ -121,7 +119,9 @@ async def test_working_system():
 
 async def main():
     """Main test function"""
-    success = await test_working_system()
+    # One client for the whole run so every tool call shares the same keep-alive connection pool
+    async with AgentCoreMCPClient() as client:
+        success = await test_working_system(client)
     
     print("\n" + "=" * 70)
     if success:
@@ -3,9 +3,12 @@
 Test the complete multi-agent workflow with proper data flow
 """
 
+import asyncio
 import os
-import json
-from utils import invoke_agent_with_boto3, get_agent_arn_from_parameter_store
+import sys
+
+from json_utils import dumps_json, loads_json
+from utils import invoke_agent_with_boto3, invoke_agent_with_boto3_stream, get_agent_arn_from_parameter_store
 
 
 def test_complete_workflow():
@@ -30,14 +33,16 @@ def test_complete_workflow():
         print(f"Query: {test_query}")
         print("\n" + "="*80 + "\n")
         
-        # Invoke the orchestrator
-        result = invoke_agent_with_boto3(orchestrator_arn, test_query)
-        
+        # Invoke the orchestrator, printing its response as it streams in
         print("✅ Complete workflow response:")
-        print(result)
+        lines = []
+        for line in invoke_agent_with_boto3_stream(orchestrator_arn, test_query):
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+            lines.append(line)
         
         # Check if the response contains evidence of both agents being called
-        result_str = str(result)
+        result_str = "\n".join(lines)
         has_langgraph_data = any(keyword in result_str.lower() for keyword in ['kitchen', 'renovation', 'analysis', 'layout'])
         has_crewai_data = any(keyword in result_str.lower() for keyword in ['cost', 'estimate', 'price', 'budget', 'materials'])
         
@@ -75,7 +80,7 @@ def test_direct_agent_calls():
         
         # Parse the JSON response to extract materials data
         try:
-            langgraph_data = json.loads(langgraph_result)
+            langgraph_data = loads_json(langgraph_result)
             if 'materials' in langgraph_data:
                 materials_data = langgraph_data['materials']
                 print(f"📋 Materials found: {len(materials_data)} items")
@@ -91,7 +96,8 @@ def test_direct_agent_calls():
                 }
                 
                 # For the direct call, we need to format this as a query
-                crewai_query = f"Estimate costs for these materials: {json.dumps(materials_data)} with cost grade: standard"
+                materials_json = dumps_json(materials_data).decode('utf-8')
+                crewai_query = f"Estimate costs for these materials: {materials_json} with cost grade: standard"
                 crewai_result = invoke_agent_with_boto3(crewai_arn, crewai_query)
                 
                 print(f"✅ CrewAI direct result (length: {len(str(crewai_result))} chars)")
@@ -102,7 +108,7 @@ def test_direct_agent_calls():
                 print("⚠️  No materials data found in LangGraph response")
                 return False
                 
-        except json.JSONDecodeError:
+        except ValueError:
             print("⚠️  Could not parse LangGraph response as JSON")
             return False
         
@@ -111,15 +117,21 @@ def test_direct_agent_calls():
         return False
 
 
+async def run_both():
+    """Run the orchestrator workflow and the direct agent calls side by side"""
+    # The two tests share no state, so their blocking boto3 calls can overlap on worker threads
+    return await asyncio.gather(
+        asyncio.to_thread(test_complete_workflow),
+        asyncio.to_thread(test_direct_agent_calls)
+    )
+
+
 if __name__ == "__main__":
     print("🔬 Testing Complete Multi-Agent Workflow")
     print("="*80)
     
-    # Test the complete workflow through orchestrator
-    workflow_success = test_complete_workflow()
-    
-    # Test direct agent calls for comparison
-    direct_success = test_direct_agent_calls()
+    # Test the complete workflow through orchestrator alongside direct agent calls for comparison
+    workflow_success, direct_success = asyncio.run(run_both())
     
     print("\n" + "="*80)
     print("📋 FINAL RESULTS:")
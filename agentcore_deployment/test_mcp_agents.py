@@ -6,7 +6,12 @@ Test MCP-based agent communication
 import asyncio
 import sys
 import os
-from mcp_client_utils import test_mcp_agent_communication, MCPAgentClient
+from importlib.util import find_spec
+from mcp_client_utils import test_mcp_agent_communication, get_shared_client
+from async_loop import run_eager
+
+# Sub-agents whose tools are listed in the discovery test
+SUB_AGENTS = ("langgraph_agent", "crewai_agent")
 
 
 async def comprehensive_mcp_test():
@@ -22,10 +27,9 @@ async def comprehensive_mcp_test():
     # Test 2: Tool discovery
     print("\n🔍 Test 2: Tool Discovery")
     print("-" * 40)
-    client = MCPAgentClient()
+    client = get_shared_client()
     
-    agents = ["langgraph_agent", "crewai_agent"]
-    for agent in agents:
+    for agent in SUB_AGENTS:
         try:
             print(f"\n🔧 {agent} tools:")
             tools = await client.list_agent_tools(agent)
@@ -87,33 +91,31 @@ async def comprehensive_mcp_test():
     print("4. Network connectivity")
 
 
+# (module, label, install hint) checked by test_mcp_requirements
+REQUIRED_MODULES = (
+    ("mcp", "MCP SDK", "pip install mcp>=1.17.1"),
+    ("mcp.client.streamable_http", "MCP streamable HTTP client", "pip install mcp>=1.17.1"),
+    ("asyncio", "AsyncIO", None),
+    ("boto3", "Boto3", "pip install boto3"),
+)
+
+
 def test_mcp_requirements():
     """Test if MCP requirements are installed"""
     print("🔍 Checking MCP Requirements...")
     
-    try:
-        import mcp
-        from mcp import ClientSession  
-        from mcp.client.streamable_http import streamablehttp_client
-        print("✅ MCP SDK: Installed")
-    except ImportError as e:
-        print(f"❌ MCP SDK: Missing - {e}")
-        print("   Install with: pip install mcp>=1.17.1")
-        return False
-    
-    try:
-        import asyncio
-        print("✅ AsyncIO: Available")
-    except ImportError:
-        print("❌ AsyncIO: Missing")
-        return False
-    
-    try:
-        import boto3
-        print("✅ Boto3: Available")
-    except ImportError:
-        print("❌ Boto3: Missing")
-        return False
+    # find_spec locates each module without executing it, so boto3's service models aren't loaded just to check
+    for module, label, hint in REQUIRED_MODULES:
+        try:
+            found = find_spec(module) is not None
+        except ImportError:
+            found = False
+        if not found:
+            print(f"❌ {label}: Missing")
+            if hint:
+                print(f"   Install with: {hint}")
+            return False
+        print(f"✅ {label}: Available")
         
     return True
 
@@ -138,7 +140,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(run_eager(main()))
     except KeyboardInterrupt:
         print("\n⏹️  Testing interrupted by user")
     except Exception as e:
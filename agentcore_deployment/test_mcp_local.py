@@ -9,6 +9,7 @@ import logging
 from datetime import timedelta
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
+from async_loop import run_eager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,7 +22,7 @@ async def test_local_mcp_server(port: int = 8000, server_name: str = "MCP Server
     headers = {}
 
     try:
-        logger.info(f"🔌 Connecting to {server_name} at {mcp_url}")
+        logger.info("🔌 Connecting to %s at %s", server_name, mcp_url)
         
         async with streamablehttp_client(
             mcp_url, 
@@ -37,15 +38,17 @@ async def test_local_mcp_server(port: int = 8000, server_name: str = "MCP Server
                 
                 # List tools
                 tool_result = await session.list_tools()
-                logger.info(f"📋 Available tools ({len(tool_result.tools)}):")
+                logger.info("📋 Available tools (%s):", len(tool_result.tools))
                 
-                for tool in tool_result.tools:
-                    logger.info(f"  🔧 {tool.name}: {tool.description}")
+                # Skip the whole listing when INFO records would be dropped anyway
+                if logger.isEnabledFor(logging.INFO):
+                    for tool in tool_result.tools:
+                        logger.info("  🔧 %s: %s", tool.name, tool.description)
                 
                 # Test basic tool if available
                 if tool_result.tools:
                     test_tool = tool_result.tools[0]
-                    logger.info(f"🧪 Testing tool: {test_tool.name}")
+                    logger.info("🧪 Testing tool: %s", test_tool.name)
                     
                     try:
                         # Try to call the tool (this will depend on the specific tool)
@@ -53,17 +56,17 @@ async def test_local_mcp_server(port: int = 8000, server_name: str = "MCP Server
                             result = await session.call_tool(test_tool.name, {})
                             logger.info("✅ Tool test successful")
                             if hasattr(result, 'content') and result.content:
-                                logger.info(f"📤 Result: {result.content[0].text[:100]}...")
+                                logger.info("📤 Result: %s...", result.content[0].text[:100])
                         else:
-                            logger.info(f"ℹ️ Skipping test for tool: {test_tool.name}")
+                            logger.info("ℹ️ Skipping test for tool: %s", test_tool.name)
                     except Exception as e:
-                        logger.warning(f"⚠️ Tool test failed: {e}")
+                        logger.warning("⚠️ Tool test failed: %s", e)
                 
-                logger.info(f"✅ {server_name} test completed successfully")
+                logger.info("✅ %s test completed successfully", server_name)
                 return True
                 
     except Exception as e:
-        logger.error(f"❌ Failed to test {server_name}: {e}")
+        logger.error("❌ Failed to test %s: %s", server_name, e)
         return False
 
 
@@ -77,28 +80,31 @@ async def test_all_local_agents():
         {"name": "Orchestrator Agent", "port": 8002}
     ]
     
-    results = {}
-    for agent in agents:
-        logger.info(f"\n{'='*50}")
-        logger.info(f"Testing {agent['name']}")
-        logger.info(f"{'='*50}")
-        
-        success = await test_local_mcp_server(agent["port"], agent["name"])
-        results[agent["name"]] = success
+    logger.info("Testing %s concurrently", ', '.join(agent['name'] for agent in agents))
+    
+    # Each server is tested over its own connection, so the checks can overlap
+    outcomes = await asyncio.gather(
+        *(test_local_mcp_server(agent["port"], agent["name"]) for agent in agents),
+        return_exceptions=True
+    )
+    results = {
+        agent["name"]: False if isinstance(outcome, Exception) else outcome
+        for agent, outcome in zip(agents, outcomes)
+    }
     
     # Summary
-    logger.info(f"\n{'='*50}")
+    logger.info("\n" + "=" * 50)
     logger.info("📊 TEST SUMMARY")
-    logger.info(f"{'='*50}")
+    logger.info("=" * 50)
     
     successful = sum(results.values())
     total = len(results)
     
     for agent_name, success in results.items():
         status = "✅ PASSED" if success else "❌ FAILED"
-        logger.info(f"{agent_name}: {status}")
+        logger.info("%s: %s", agent_name, status)
     
-    logger.info(f"\nOverall: {successful}/{total} agents passed")
+    logger.info("\nOverall: %s/%s agents passed", successful, total)
     
     return results
 
@@ -112,4 +118,4 @@ if __name__ == "__main__":
     print("- Orchestrator: python orchestrator_agent/orchestrator_mcp_server.py (port 8002)")
     print("=" * 60)
     
-    asyncio.run(test_all_local_agents())
+    asyncio.run(run_eager(test_all_local_agents()))
@@ -5,45 +5,104 @@ Tests agent communication, deployment status, and end-to-end workflows
 """
 
 import asyncio
-import json
 import logging
 import sys
 import os
 import argparse
-from typing import Dict, Any, List
+from collections import Counter
+from typing import Any, BinaryIO, Dict, List, Optional
 from datetime import datetime
 
 # Add mcp_base to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'mcp_base'))
 
-from mcp_base.mcp_client_utils import AgentCoreMCPClient, discover_available_agents
-from mcp_base.auth_utils import get_bearer_token_for_agent
-import boto3
+from mcp_base.mcp_client_utils import AgentCoreMCPClient
+from async_loop import run_eager
+from json_utils import dumps_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+def result_status(result: Any) -> str:
+    """Classify a tool call result as passed (a dict without an error key) or failed"""
+    return "passed" if isinstance(result, dict) and "error" not in result else "failed"
+
+
+# Agents deployed by this project, in the order they are tested
+AGENTS = ("langgraph_agent", "crewai_agent", "orchestrator_agent")
+
+# Materials used when testing CrewAI directly, and as the fallback when the
+# end-to-end kitchen analysis step returns none
+TEST_MATERIALS = (
+    {"material_type": "granite", "area_sqm": 8.0},
+    {"material_type": "wood", "area_sqm": 15.0},
+    {"material_type": "tile", "area_sqm": 12.0}
+)
+
+# Agent-specific functionality test per agent: (subtest name, label, tool name, tool arguments)
+AGENT_SPECIFIC_TESTS = {
+    "langgraph_agent": (
+        "kitchen_analysis", "Kitchen analysis", "analyze_kitchen",
+        {"prompt": "Test kitchen analysis for renovation planning", "image_path": None}
+    ),
+    "crewai_agent": (
+        "cost_estimation", "Cost estimation", "estimate_renovation_costs",
+        {"materials_data": TEST_MATERIALS, "cost_grade": "standard"}
+    ),
+    "orchestrator_agent": (
+        "workflow_orchestration", "Workflow orchestration", "orchestrate_full_workflow",
+        {"query": "Test kitchen renovation workflow", "cost_grade": "standard", "image_path": None}
+    )
+}
+
+# Upper bound on any single top-level test in run_all_tests
+PER_TEST_TIMEOUT = 300
+
+
 class MCPSystemTester:
     """Comprehensive testing suite for MCP agents"""
     
     def __init__(self, region: str = "us-west-2"):
         self.region = region
         self.client = AgentCoreMCPClient(region)
+        # Stamp the session once so its id and timestamp describe the same instant
+        started_at = datetime.now()
         self.test_results = {
-            "test_session_id": f"test_{int(datetime.now().timestamp())}",
-            "timestamp": datetime.now().isoformat(),
+            "test_session_id": f"test_{int(started_at.timestamp())}",
+            "timestamp": started_at.isoformat(),
             "region": region,
             "tests": {}
         }
+        # Agents whose health check failed during run_all_tests' warm-up, agent name -> error
+        self._warmup_errors: Dict[str, str] = {}
+    
+    async def _warm_up_agents(self):
+        """Health-check every agent concurrently to open pooled connections and spot dead agents early"""
+        logger.info("🔌 Warming up connections to %s agents...", len(AGENTS))
+        results = await asyncio.gather(
+            *(self.client.health_check_agent(agent_name) for agent_name in AGENTS),
+            return_exceptions=True
+        )
+        for agent_name, result in zip(AGENTS, results):
+            if isinstance(result, Exception):
+                error = str(result)
+            elif result_status(result) != "passed":
+                error = str(result.get("error", result))
+            else:
+                continue
+            self._warmup_errors[agent_name] = error
+            logger.warning("  ⚠️ %s failed its warm-up health check: %s", agent_name, error)
     
     async def test_agent_discovery(self) -> Dict[str, Any]:
         """Test discovery of all agents in the ecosystem"""
         logger.info("🔍 Testing agent discovery...")
         
+        from mcp_base.mcp_client_utils import discover_available_agents
+        
         try:
-            ecosystem_info = await discover_available_agents(self.region)
+            ecosystem_info = await discover_available_agents(self.region, client=self.client)
             
             test_result = {
                 "test_name": "agent_discovery",
@@ -54,17 +113,17 @@ class MCPSystemTester:
             }
             
             if ecosystem_info:
-                logger.info(f"✅ Discovery test passed - Found {len(ecosystem_info)} agents")
+                logger.info("✅ Discovery test passed - Found %s agents", len(ecosystem_info))
                 for agent_name, tools in ecosystem_info.items():
                     tool_count = len(tools) if isinstance(tools, list) else 0
-                    logger.info(f"  • {agent_name}: {tool_count} tools")
+                    logger.info("  • %s: %s tools", agent_name, tool_count)
             else:
                 logger.error("❌ Discovery test failed - No agents found")
             
             return test_result
             
         except Exception as e:
-            logger.error(f"❌ Discovery test failed with exception: {e}")
+            logger.error("❌ Discovery test failed with exception: %s", e)
             return {
                 "test_name": "agent_discovery",
                 "status": "error",
@@ -73,7 +132,7 @@ class MCPSystemTester:
     
     async def test_individual_agent(self, agent_name: str) -> Dict[str, Any]:
         """Test individual agent functionality"""
-        logger.info(f"🧪 Testing {agent_name}...")
+        logger.info("🧪 Testing %s...", agent_name)
         
         test_result = {
             "test_name": f"individual_agent_{agent_name}",
@@ -81,44 +140,22 @@ class MCPSystemTester:
             "subtests": {}
         }
         
-        # Test 1: Health check
-        try:
-            health_result = await self.client.health_check_agent(agent_name)
-            test_result["subtests"]["health_check"] = {
-                "status": "passed" if "error" not in health_result else "failed",
-                "result": health_result
-            }
-            logger.info(f"  ✅ Health check: {'passed' if 'error' not in health_result else 'failed'}")
-        except Exception as e:
-            test_result["subtests"]["health_check"] = {
-                "status": "error",
-                "error": str(e)
-            }
-            logger.error(f"  ❌ Health check failed: {e}")
+        if agent_name in self._warmup_errors:
+            test_result["status"] = "error"
+            test_result["error"] = f"agent unreachable at warmup: {self._warmup_errors[agent_name]}"
+            logger.error("❌ Skipping %s: %s", agent_name, test_result["error"])
+            return test_result
         
-        # Test 2: Tool listing
-        try:
-            tools = await self.client.list_agent_tools(agent_name)
-            test_result["subtests"]["tool_listing"] = {
-                "status": "passed" if tools and not any("error" in tool for tool in tools) else "failed",
-                "tool_count": len(tools) if tools else 0,
-                "tools": tools
-            }
-            logger.info(f"  ✅ Tool listing: {len(tools) if tools else 0} tools found")
-        except Exception as e:
-            test_result["subtests"]["tool_listing"] = {
-                "status": "error", 
-                "error": str(e)
-            }
-            logger.error(f"  ❌ Tool listing failed: {e}")
+        # Health check, tool listing and the agent-specific call are independent round trips,
+        # so run them concurrently; each helper records its own subtest
+        subtests = [
+            self._test_health_check(agent_name, test_result),
+            self._test_tool_listing(agent_name, test_result)
+        ]
+        if agent_name in AGENT_SPECIFIC_TESTS:
+            subtests.append(self._test_agent_specific(agent_name, test_result))
         
-        # Test 3: Agent-specific functionality
-        if agent_name == "langgraph_agent":
-            await self._test_langgraph_specific(agent_name, test_result)
-        elif agent_name == "crewai_agent":
-            await self._test_crewai_specific(agent_name, test_result)
-        elif agent_name == "orchestrator_agent":
-            await self._test_orchestrator_specific(agent_name, test_result)
+        await asyncio.gather(*subtests)
         
         # Overall status
         subtest_statuses = [subtest.get("status") for subtest in test_result["subtests"].values()]
@@ -126,86 +163,59 @@ class MCPSystemTester:
         
         return test_result
     
-    async def _test_langgraph_specific(self, agent_name: str, test_result: Dict):
-        """Test LangGraph agent specific functionality"""
+    async def _test_health_check(self, agent_name: str, test_result: Dict):
+        """Test agent health check"""
         try:
-            logger.info(f"  🏠 Testing LangGraph kitchen analysis...")
-            result = await self.client.invoke_agent_tool(
-                agent_name,
-                "analyze_kitchen",
-                prompt="Test kitchen analysis for renovation planning",
-                image_path=None
-            )
-            
-            test_result["subtests"]["kitchen_analysis"] = {
-                "status": "passed" if "error" not in result else "failed",
-                "result": result
+            health_result = await self.client.health_check_agent(agent_name)
+            test_result["subtests"]["health_check"] = {
+                "status": result_status(health_result),
+                "result": health_result
             }
-            logger.info(f"    ✅ Kitchen analysis: {'passed' if 'error' not in result else 'failed'}")
-            
+            logger.info("  ✅ Health check: %s", result_status(health_result))
         except Exception as e:
-            test_result["subtests"]["kitchen_analysis"] = {
+            test_result["subtests"]["health_check"] = {
                 "status": "error",
                 "error": str(e)
             }
-            logger.error(f"    ❌ Kitchen analysis failed: {e}")
+            logger.error("  ❌ Health check failed: %s", e)
     
-    async def _test_crewai_specific(self, agent_name: str, test_result: Dict):
-        """Test CrewAI agent specific functionality"""
+    async def _test_tool_listing(self, agent_name: str, test_result: Dict):
+        """Test agent tool listing"""
         try:
-            logger.info(f"  💰 Testing CrewAI cost estimation...")
-            
-            # Test materials data
-            test_materials = [
-                {"material_type": "granite", "area_sqm": 8.0},
-                {"material_type": "wood", "area_sqm": 15.0},
-                {"material_type": "tile", "area_sqm": 12.0}
-            ]
-            
-            result = await self.client.invoke_agent_tool(
-                agent_name,
-                "estimate_renovation_costs",
-                materials_data=test_materials,
-                cost_grade="standard"
-            )
-            
-            test_result["subtests"]["cost_estimation"] = {
-                "status": "passed" if "error" not in result else "failed",
-                "result": result
+            tools = await self.client.list_agent_tools(agent_name)
+            tool_count = len(tools) if tools else 0
+            test_result["subtests"]["tool_listing"] = {
+                "status": "passed" if tools and not any("error" in tool for tool in tools) else "failed",
+                "tool_count": tool_count,
+                "tools": tools
             }
-            logger.info(f"    ✅ Cost estimation: {'passed' if 'error' not in result else 'failed'}")
-            
+            logger.info("  ✅ Tool listing: %s tools found", tool_count)
         except Exception as e:
-            test_result["subtests"]["cost_estimation"] = {
-                "status": "error",
+            test_result["subtests"]["tool_listing"] = {
+                "status": "error", 
                 "error": str(e)
             }
-            logger.error(f"    ❌ Cost estimation failed: {e}")
+            logger.error("  ❌ Tool listing failed: %s", e)
     
-    async def _test_orchestrator_specific(self, agent_name: str, test_result: Dict):
-        """Test Orchestrator agent specific functionality"""
+    async def _test_agent_specific(self, agent_name: str, test_result: Dict):
+        """Test the agent's own tool as described by AGENT_SPECIFIC_TESTS"""
+        subtest_name, label, tool_name, arguments = AGENT_SPECIFIC_TESTS[agent_name]
         try:
-            logger.info(f"  🎯 Testing Orchestrator workflow...")
-            result = await self.client.invoke_agent_tool(
-                agent_name,
-                "orchestrate_full_workflow",
-                query="Test kitchen renovation workflow",
-                cost_grade="standard",
-                image_path=None
-            )
+            logger.info("  🧪 Testing %s on %s...", label.lower(), agent_name)
+            result = await self.client.invoke_agent_tool(agent_name, tool_name, **arguments)
             
-            test_result["subtests"]["workflow_orchestration"] = {
-                "status": "passed" if "error" not in result else "failed",
+            test_result["subtests"][subtest_name] = {
+                "status": result_status(result),
                 "result": result
             }
-            logger.info(f"    ✅ Workflow orchestration: {'passed' if 'error' not in result else 'failed'}")
+            logger.info("    ✅ %s: %s", label, result_status(result))
             
         except Exception as e:
-            test_result["subtests"]["workflow_orchestration"] = {
+            test_result["subtests"][subtest_name] = {
                 "status": "error",
                 "error": str(e)
             }
-            logger.error(f"    ❌ Workflow orchestration failed: {e}")
+            logger.error("    ❌ %s failed: %s", label, e)
     
     async def test_end_to_end_workflow(self) -> Dict[str, Any]:
         """Test complete end-to-end workflow"""
@@ -216,66 +226,37 @@ class MCPSystemTester:
             "workflow_steps": []
         }
         
+        if self._warmup_errors:
+            test_result["status"] = "error"
+            test_result["error"] = f"agents unreachable at warmup: {', '.join(self._warmup_errors)}"
+            logger.error("❌ Skipping end-to-end workflow: %s", test_result["error"])
+            return test_result
+        
         try:
-            # Step 1: Kitchen Analysis via LangGraph
-            logger.info("  📊 Step 1: Kitchen Analysis...")
-            kitchen_result = await self.client.invoke_agent_tool(
-                "langgraph_agent",
-                "analyze_kitchen",
-                prompt="Analyze kitchen for renovation planning with standard grade materials",
-                image_path=None
+            # Full orchestration (step 3) doesn't depend on steps 1-2, so it runs alongside that chain
+            (kitchen_result, cost_result), orchestration_result = await asyncio.gather(
+                self._run_analysis_chain(),
+                self._run_full_orchestration()
             )
             
             test_result["workflow_steps"].append({
                 "step": 1,
                 "name": "kitchen_analysis",
-                "status": "passed" if "error" not in kitchen_result else "failed",
+                "status": result_status(kitchen_result),
                 "result": kitchen_result
             })
             
-            # Extract materials for step 2
-            materials_data = []
-            if "error" not in kitchen_result and "data" in kitchen_result:
-                materials_data = kitchen_result["data"].get("materials", [])
-            
-            if not materials_data:
-                # Use default test materials
-                materials_data = [
-                    {"material_type": "granite", "area_sqm": 8.0},
-                    {"material_type": "wood", "area_sqm": 15.0},
-                    {"material_type": "tile", "area_sqm": 12.0}
-                ]
-            
-            # Step 2: Cost Estimation via CrewAI
-            logger.info("  💰 Step 2: Cost Estimation...")
-            cost_result = await self.client.invoke_agent_tool(
-                "crewai_agent",
-                "estimate_renovation_costs",
-                materials_data=materials_data,
-                cost_grade="standard"
-            )
-            
             test_result["workflow_steps"].append({
                 "step": 2,
                 "name": "cost_estimation", 
-                "status": "passed" if "error" not in cost_result else "failed",
+                "status": result_status(cost_result),
                 "result": cost_result
             })
             
-            # Step 3: Full Orchestration
-            logger.info("  🎯 Step 3: Full Orchestration...")
-            orchestration_result = await self.client.invoke_agent_tool(
-                "orchestrator_agent",
-                "orchestrate_full_workflow",
-                query="Complete kitchen renovation analysis workflow test",
-                cost_grade="standard",
-                image_path=None
-            )
-            
             test_result["workflow_steps"].append({
                 "step": 3,
                 "name": "orchestration",
-                "status": "passed" if "error" not in orchestration_result else "failed", 
+                "status": result_status(orchestration_result), 
                 "result": orchestration_result
             })
             
@@ -283,30 +264,73 @@ class MCPSystemTester:
             step_statuses = [step["status"] for step in test_result["workflow_steps"]]
             test_result["status"] = "passed" if all(status == "passed" for status in step_statuses) else "failed"
             
-            logger.info(f"✅ End-to-end workflow: {'passed' if test_result['status'] == 'passed' else 'failed'}")
+            logger.info("✅ End-to-end workflow: %s", 'passed' if test_result['status'] == 'passed' else 'failed')
             
         except Exception as e:
             test_result["status"] = "error"
             test_result["error"] = str(e)
-            logger.error(f"❌ End-to-end workflow failed: {e}")
+            logger.error("❌ End-to-end workflow failed: %s", e)
         
         return test_result
     
+    async def _run_analysis_chain(self):
+        """Run kitchen analysis via LangGraph, then cost estimation via CrewAI on its materials"""
+        # Step 1: Kitchen Analysis via LangGraph
+        logger.info("  📊 Step 1: Kitchen Analysis...")
+        kitchen_result = await self.client.invoke_agent_tool(
+            "langgraph_agent",
+            "analyze_kitchen",
+            prompt="Analyze kitchen for renovation planning with standard grade materials",
+            image_path=None
+        )
+        
+        # Extract materials for step 2
+        materials_data = []
+        if result_status(kitchen_result) == "passed" and "data" in kitchen_result:
+            materials_data = kitchen_result["data"].get("materials", [])
+        
+        if not materials_data:
+            # Use default test materials
+            materials_data = TEST_MATERIALS
+        
+        # Step 2: Cost Estimation via CrewAI
+        logger.info("  💰 Step 2: Cost Estimation...")
+        cost_result = await self.client.invoke_agent_tool(
+            "crewai_agent",
+            "estimate_renovation_costs",
+            materials_data=materials_data,
+            cost_grade="standard"
+        )
+        
+        return kitchen_result, cost_result
+    
+    async def _run_full_orchestration(self):
+        """Run the full workflow through the orchestrator agent"""
+        # Step 3: Full Orchestration
+        logger.info("  🎯 Step 3: Full Orchestration...")
+        return await self.client.invoke_agent_tool(
+            "orchestrator_agent",
+            "orchestrate_full_workflow",
+            query="Complete kitchen renovation analysis workflow test",
+            cost_grade="standard",
+            image_path=None
+        )
+    
     async def test_authentication(self) -> Dict[str, Any]:
         """Test Cognito authentication for agents"""
         logger.info("🔐 Testing authentication...")
+        # Cognito helpers are only needed here, so don't load them for the other tests
+        from mcp_base.auth_utils import get_bearer_token_for_agent_cached
         
         test_result = {
             "test_name": "authentication",
             "agent_auth_tests": {}
         }
         
-        agent_names = ["langgraph_agent", "crewai_agent", "orchestrator_agent"]
-        
-        for agent_name in agent_names:
+        for agent_name in AGENTS:
             try:
                 # Try to get bearer token
-                token = get_bearer_token_for_agent(agent_name, self.region)
+                token = get_bearer_token_for_agent_cached(agent_name, self.region)
                 
                 test_result["agent_auth_tests"][agent_name] = {
                     "status": "passed" if token else "failed",
@@ -314,14 +338,14 @@ class MCPSystemTester:
                     "token_length": len(token) if token else 0
                 }
                 
-                logger.info(f"  • {agent_name}: {'✅ token available' if token else '❌ no token'}")
+                logger.info("  • %s: %s", agent_name, '✅ token available' if token else '❌ no token')
                 
             except Exception as e:
                 test_result["agent_auth_tests"][agent_name] = {
                     "status": "error",
                     "error": str(e)
                 }
-                logger.error(f"  • {agent_name}: ❌ auth error: {e}")
+                logger.error("  • %s: ❌ auth error: %s", agent_name, e)
         
         # Overall auth status
         auth_statuses = [result["status"] for result in test_result["agent_auth_tests"].values()]
@@ -329,46 +353,69 @@ class MCPSystemTester:
         
         return test_result
     
-    async def run_all_tests(self) -> Dict[str, Any]:
-        """Run all tests in the suite"""
+    async def run_all_tests(self, stream: Optional[BinaryIO] = None) -> Dict[str, Any]:
+        """
+        Run all tests in the suite
+        
+        Args:
+            stream: Binary file that receives each test result as a JSON line as soon as it
+                completes; only the test statuses are then kept for the returned summary
+        """
         logger.info("🧪 Starting comprehensive MCP system test suite...")
         logger.info("=" * 60)
         
-        # Run all tests
+        # One concurrent health check per agent up front warms the client's connection pool,
+        # and lets the agent tests fail fast instead of each waiting out an unreachable agent
+        await self._warm_up_agents()
+        
+        # Run all tests, each under its own deadline so a hung endpoint can't stall the suite
         tests = [
-            self.test_agent_discovery(),
-            self.test_individual_agent("langgraph_agent"),
-            self.test_individual_agent("crewai_agent"), 
-            self.test_individual_agent("orchestrator_agent"),
-            self.test_authentication(),
-            self.test_end_to_end_workflow()
+            ("agent_discovery", self.test_agent_discovery()),
+            *((f"individual_agent_{agent_name}", self.test_individual_agent(agent_name)) for agent_name in AGENTS),
+            ("authentication", self.test_authentication()),
+            ("end_to_end_workflow", self.test_end_to_end_workflow())
         ]
         
-        results = await asyncio.gather(*tests, return_exceptions=True)
+        runs = [self._run_test(name, coro) for name, coro in tests]
         
-        # Process results
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                test_name = f"test_{i}"
-                self.test_results["tests"][test_name] = {
-                    "status": "error",
-                    "error": str(result)
+        if stream is None:
+            # gather keeps the order of the test table, so results pair up with its names directly
+            results = await asyncio.gather(*runs)
+            self.test_results["tests"] = dict(zip((name for name, _ in tests), results))
+        else:
+            # Emit each result as it finishes and drop its payload, so large tool results
+            # aren't all held in memory until the end
+            for next_result in asyncio.as_completed(runs):
+                result = await next_result
+                stream.write(dumps_json(result) + b"\n")
+                stream.flush()
+                self.test_results["tests"][result["test_name"]] = {
+                    "test_name": result["test_name"],
+                    "status": result.get("status")
                 }
-            else:
-                test_name = result.get("test_name", f"test_{i}")
-                self.test_results["tests"][test_name] = result
         
         # Generate summary
         self._generate_test_summary()
         
         return self.test_results
     
+    async def _run_test(self, test_name: str, coro) -> Dict[str, Any]:
+        """Await a test coroutine, turning a timeout or uncaught exception into an error result"""
+        try:
+            return await asyncio.wait_for(coro, timeout=PER_TEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("❌ %s timed out after %ss", test_name, PER_TEST_TIMEOUT)
+            return {"test_name": test_name, "status": "error", "error": f"Timed out after {PER_TEST_TIMEOUT}s"}
+        except Exception as e:
+            return {"test_name": test_name, "status": "error", "error": str(e)}
+    
     def _generate_test_summary(self):
         """Generate test summary"""
         total_tests = len(self.test_results["tests"])
-        passed_tests = sum(1 for test in self.test_results["tests"].values() if test.get("status") == "passed")
-        failed_tests = sum(1 for test in self.test_results["tests"].values() if test.get("status") == "failed") 
-        error_tests = sum(1 for test in self.test_results["tests"].values() if test.get("status") == "error")
+        status_counts = Counter(test.get("status") for test in self.test_results["tests"].values())
+        passed_tests = status_counts["passed"]
+        failed_tests = status_counts["failed"]
+        error_tests = status_counts["error"]
         
         self.test_results["summary"] = {
             "total_tests": total_tests,
@@ -381,11 +428,11 @@ class MCPSystemTester:
         logger.info("=" * 60)
         logger.info("📊 TEST SUMMARY")
         logger.info("=" * 60)
-        logger.info(f"Total Tests: {total_tests}")
-        logger.info(f"✅ Passed: {passed_tests}")
-        logger.info(f"❌ Failed: {failed_tests}")
-        logger.info(f"⚠️ Errors: {error_tests}")
-        logger.info(f"🎯 Success Rate: {self.test_results['summary']['success_rate']:.1f}%")
+        logger.info("Total Tests: %s", total_tests)
+        logger.info("✅ Passed: %s", passed_tests)
+        logger.info("❌ Failed: %s", failed_tests)
+        logger.info("⚠️ Errors: %s", error_tests)
+        logger.info("🎯 Success Rate: %.1f%%", self.test_results['summary']['success_rate'])
         logger.info("=" * 60)
 
 
@@ -396,35 +443,46 @@ async def main():
     parser.add_argument("--agent", help="Test specific agent only")
     parser.add_argument("--test", help="Run specific test only (discovery, auth, e2e)")
     parser.add_argument("--output", help="Output file for test results JSON")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print each test result as a JSON line as soon as it completes (full suite only); "
+                             "the summary is then only written to --output")
     
     args = parser.parse_args()
     
     tester = MCPSystemTester(args.region)
     
-    try:
-        if args.test == "discovery":
-            result = await tester.test_agent_discovery()
-        elif args.test == "auth":
-            result = await tester.test_authentication()
-        elif args.test == "e2e":
-            result = await tester.test_end_to_end_workflow()
-        elif args.agent:
-            result = await tester.test_individual_agent(args.agent)
-        else:
-            result = await tester.run_all_tests()
+    # Every test shares the tester's client, so its connection pool is closed once at the end
+    async with tester.client:
+        try:
+            if args.test == "discovery":
+                result = await tester.test_agent_discovery()
+            elif args.test == "auth":
+                result = await tester.test_authentication()
+            elif args.test == "e2e":
+                result = await tester.test_end_to_end_workflow()
+            elif args.agent:
+                result = await tester.test_individual_agent(args.agent)
+            elif args.stream:
+                sys.stdout.flush()
+                result = await tester.run_all_tests(stream=sys.stdout.buffer)
+            else:
+                result = await tester.run_all_tests()
+            
+            # Output results
+            if args.output:
+                with open(args.output, 'wb') as f:
+                    f.write(dumps_json(result, indent=True))
+                logger.info("📄 Test results saved to %s", args.output)
+            elif not args.stream:
+                # Flush any buffered text first so the bytes land after it
+                sys.stdout.flush()
+                sys.stdout.buffer.write(dumps_json(result, indent=True) + b"\n")
+                sys.stdout.buffer.flush()
         
-        # Output results
-        if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(result, f, indent=2)
-            logger.info(f"📄 Test results saved to {args.output}")
-        else:
-            print(json.dumps(result, indent=2))
-    
-    except Exception as e:
-        logger.error(f"❌ Test execution failed: {e}")
-        sys.exit(1)
+        except Exception as e:
+            logger.error("❌ Test execution failed: %s", e)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run_eager(main()))
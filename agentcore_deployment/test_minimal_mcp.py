@@ -5,6 +5,12 @@ Ultra-minimal MCP server test - bypasses all our custom code
 
 from mcp.server.fastmcp import FastMCP
 
+# uvloop is optional - fall back to the default asyncio loop when unavailable
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Create the simplest possible MCP server
 mcp = FastMCP(host="0.0.0.0", stateless_http=True)
 
@@ -15,4 +21,7 @@ def test_simple():
 
 if __name__ == "__main__":
     print("🔧 Starting ultra-minimal MCP server...")
+    if uvloop:
+        # FastMCP starts its loop through asyncio, which picks up the uvloop policy
+        uvloop.install()
     mcp.run(transport="streamable-http", port=8000)
@@ -4,6 +4,7 @@ Test the orchestrator agent calling sub-agents
 """
 
 import os
+import sys
 from utils import invoke_agent_with_boto3, get_agent_arn_from_parameter_store
 
 
@@ -53,20 +54,26 @@ def test_individual_agents():
     
     try:
         # Test LangGraph agent
-        print("1. Testing LangGraph Agent...")
+        print("1. Testing LangGraph Agent...", flush=True)
         langgraph_arn = get_agent_arn_from_parameter_store("langgraph_agent")
         langgraph_result = invoke_agent_with_boto3(langgraph_arn, "Analyze a kitchen for renovation planning")
-        print(f"✅ LangGraph response length: {len(str(langgraph_result))} characters")
-        print(f"Preview: {str(langgraph_result)[:200]}...")
-        
-        print("\n" + "-"*40 + "\n")
+        # Results are already strings, so slice them directly and write each block in one call
+        sys.stdout.write(
+            f"✅ LangGraph response length: {len(langgraph_result)} characters\n"
+            f"Preview: {langgraph_result[:200]}...\n"
+            "\n" + "-"*40 + "\n\n"
+        )
+        sys.stdout.flush()
         
         # Test CrewAI agent
-        print("2. Testing CrewAI Agent...")
+        print("2. Testing CrewAI Agent...", flush=True)
         crewai_arn = get_agent_arn_from_parameter_store("crewai_agent")
         crewai_result = invoke_agent_with_boto3(crewai_arn, "Estimate costs for kitchen renovation materials")
-        print(f"✅ CrewAI response length: {len(str(crewai_result))} characters")
-        print(f"Preview: {str(crewai_result)[:200]}...")
+        sys.stdout.write(
+            f"✅ CrewAI response length: {len(crewai_result)} characters\n"
+            f"Preview: {crewai_result[:200]}...\n"
+        )
+        sys.stdout.flush()
         
         return True
         
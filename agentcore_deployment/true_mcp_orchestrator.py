@@ -6,9 +6,13 @@ This orchestrator uses MCP protocol to communicate with LangGraph and CrewAI age
 import json
 import asyncio
 import logging
+import time
 import boto3
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from urllib.parse import quote
+from async_loop import run_async
+from utils import get_agentcore_client, get_agent_arn_from_parameter_store
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,117 @@ except ImportError as e:
     logger.error(f"❌ MCP SDK not available: {e}")
     MCP_AVAILABLE = False
 
+# Materials costed when the kitchen analysis doesn't report any
+DEFAULT_MATERIALS = (
+    {"material_type": "wood", "area_sqm": 14.0, "location": "cabinet"},
+    {"material_type": "granite", "area_sqm": 7.5, "location": "countertop"},
+    {"material_type": "tile", "area_sqm": 18.5, "location": "flooring"}
+)
+
+
+# Pooled MCP sessions are reopened after this many seconds
+MCP_SESSION_MAX_AGE = 240
+
+
+class _PooledSession:
+    """An initialized MCP session and the task that keeps its transport open"""
+    
+    def __init__(self, session, owner: asyncio.Task, closing: asyncio.Event):
+        self.session = session
+        self.owner = owner
+        self.closing = closing
+        self.created_at = time.monotonic()
+    
+    def usable(self) -> bool:
+        return not self.owner.done() and not self.closing.is_set() and \
+            time.monotonic() - self.created_at < MCP_SESSION_MAX_AGE
+
+
+class MCPSessionPool:
+    """
+    Idle initialized MCP sessions per agent URL, so repeat tool calls skip the
+    connect and initialize round trips
+    
+    The MCP client transport runs in an anyio task group, which has to be exited
+    by the task that entered it. Each session is therefore opened and closed by
+    its own owner task, and callers only borrow the session object.
+    """
+    
+    def __init__(self):
+        self._idle: Dict[str, List[_PooledSession]] = {}
+        self._checked_out: Dict[int, _PooledSession] = {}
+        self._open: List[_PooledSession] = []
+    
+    async def acquire(self, url: str, headers: Dict[str, str]):
+        """Borrow an initialized session for url, opening a new one if none is idle"""
+        idle = self._idle.get(url, [])
+        while idle:
+            pooled = idle.pop()
+            if pooled.usable():
+                break
+            pooled.closing.set()
+        else:
+            pooled = await self._open_session(url, headers)
+        self._checked_out[id(pooled.session)] = pooled
+        return pooled.session
+    
+    def release(self, url: str, session):
+        """Return a borrowed session to the pool once its call succeeded"""
+        pooled = self._checked_out.pop(id(session))
+        if pooled.usable():
+            self._idle.setdefault(url, []).append(pooled)
+        else:
+            pooled.closing.set()
+    
+    def discard(self, session):
+        """Close a borrowed session whose call failed instead of reusing it"""
+        self._checked_out.pop(id(session)).closing.set()
+    
+    async def close_all(self):
+        """Close every session the pool has opened"""
+        for pooled in self._open:
+            pooled.closing.set()
+        await asyncio.gather(*(pooled.owner for pooled in self._open), return_exceptions=True)
+        self._idle.clear()
+        self._checked_out.clear()
+        self._open.clear()
+    
+    async def _open_session(self, url: str, headers: Dict[str, str]) -> _PooledSession:
+        ready = asyncio.get_running_loop().create_future()
+        closing = asyncio.Event()
+        
+        async def hold_open():
+            try:
+                async with streamablehttp_client(url, headers, timeout=120, terminate_on_close=False) as (
+                    read_stream,
+                    write_stream,
+                    _,
+                ):
+                    async with ClientSession(read_stream, write_stream) as session:
+                        await session.initialize()
+                        ready.set_result(session)
+                        await closing.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    logger.warning(f"Pooled MCP session for {url[:50]}... closed with error: {e}")
+            finally:
+                if not ready.done():
+                    ready.cancel()
+        
+        owner = asyncio.create_task(hold_open())
+        try:
+            session = await ready
+        except BaseException:
+            # Don't leave a half-opened session running if this caller gave up on it
+            owner.cancel()
+            raise
+        pooled = _PooledSession(session, owner, closing)
+        self._open = [other for other in self._open if not other.owner.done()]
+        self._open.append(pooled)
+        return pooled
+
 
 class TrueMCPOrchestrator:
     """Orchestrator that uses MCP to communicate with other agents"""
@@ -30,19 +145,35 @@ class TrueMCPOrchestrator:
     def __init__(self, region: str = "us-west-2"):
         self.region = region
         self.session = boto3.Session()
+        self._mcp_sessions = MCPSessionPool()
+        # Agent name -> MCP URL, resolved once per orchestrator
+        self._url_cache: Dict[str, str] = {}
+    
+    async def close(self):
+        """Close the pooled MCP sessions"""
+        await self._mcp_sessions.close_all()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
         
     async def get_agent_mcp_url(self, agent_name: str) -> str:
         """Get MCP URL for an agent"""
+        if agent_name in self._url_cache:
+            return self._url_cache[agent_name]
+        
         try:
-            # Get agent ARN from Parameter Store
-            ssm_client = boto3.client('ssm', region_name=self.region)
-            response = ssm_client.get_parameter(Name=f'/agents/{agent_name}_arn')
-            agent_arn = response['Parameter']['Value']
+            # Get agent ARN from Parameter Store (cached between calls); a cache miss is a
+            # blocking SSM call, so keep it off the event loop
+            agent_arn = await asyncio.to_thread(get_agent_arn_from_parameter_store, agent_name, self.region)
             
             # Encode ARN for MCP URL
-            encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
+            encoded_arn = quote(agent_arn, safe='')
             mcp_url = f"https://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
             
+            self._url_cache[agent_name] = mcp_url
             return mcp_url
         except Exception as e:
             logger.error(f"Failed to get MCP URL for {agent_name}: {e}")
@@ -61,45 +192,46 @@ class TrueMCPOrchestrator:
             logger.error(f"Failed to get auth headers: {e}")
             return {"Content-Type": "application/json"}
     
-    async def invoke_agent_via_mcp(self, agent_name: str, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Invoke an agent via MCP protocol"""
+    async def invoke_agent_via_mcp(self, agent_name: str, tool_name: str, arguments: Dict[str, Any],
+                                   mcp_url: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Invoke an agent via MCP protocol, looking up its URL and auth headers unless they are passed in"""
         if not MCP_AVAILABLE:
             return {"error": "MCP SDK not available", "fallback": True}
         
         try:
-            mcp_url = await self.get_agent_mcp_url(agent_name)
-            headers = await self.get_auth_headers()
+            if mcp_url is None:
+                mcp_url = await self.get_agent_mcp_url(agent_name)
+            if headers is None:
+                headers = await self.get_auth_headers()
             
             logger.info(f"🔗 MCP call: {agent_name}.{tool_name} via {mcp_url[:50]}...")
             
-            # For now, let's simulate the MCP call structure
-            # In a full implementation, this would be a real MCP call
-            async with streamablehttp_client(mcp_url, headers, timeout=120, terminate_on_close=False) as (
-                read_stream,
-                write_stream,
-                _,
-            ):
-                async with ClientSession(read_stream, write_stream) as session:
-                    await session.initialize()
-                    
-                    # Call the tool via MCP
-                    result = await session.call_tool(
-                        name=tool_name,
-                        arguments=arguments
-                    )
-                    
-                    # Process MCP response
-                    if result.content and len(result.content) > 0:
-                        if hasattr(result.content[0], 'text'):
-                            response_text = result.content[0].text
-                            try:
-                                return json.loads(response_text)
-                            except json.JSONDecodeError:
-                                return {"result": response_text, "mcp_protocol_used": True}
-                        else:
-                            return {"result": str(result.content[0]), "mcp_protocol_used": True}
-                    else:
-                        return {"result": "No content returned", "mcp_protocol_used": True}
+            # Reuse an initialized session for this agent when one is idle
+            session = await self._mcp_sessions.acquire(mcp_url, headers)
+            try:
+                # Call the tool via MCP
+                result = await session.call_tool(
+                    name=tool_name,
+                    arguments=arguments
+                )
+            except BaseException:
+                # Includes cancellation of a speculative call, which may leave the session mid-request
+                self._mcp_sessions.discard(session)
+                raise
+            self._mcp_sessions.release(mcp_url, session)
+            
+            # Process MCP response
+            if result.content and len(result.content) > 0:
+                if hasattr(result.content[0], 'text'):
+                    response_text = result.content[0].text
+                    try:
+                        return json.loads(response_text)
+                    except json.JSONDecodeError:
+                        return {"result": response_text, "mcp_protocol_used": True}
+                else:
+                    return {"result": str(result.content[0]), "mcp_protocol_used": True}
+            else:
+                return {"result": "No content returned", "mcp_protocol_used": True}
                         
         except Exception as e:
             logger.error(f"MCP call failed for {agent_name}.{tool_name}: {e}")
@@ -107,34 +239,39 @@ class TrueMCPOrchestrator:
             # Fall back to direct bedrock-agentcore call
             return await self.fallback_direct_call(agent_name, arguments.get("prompt", str(arguments)))
     
+    def _invoke_agent_direct(self, agent_name: str, query: str) -> str:
+        """Invoke an agent through bedrock-agentcore and read its whole response (blocking)"""
+        # Get agent ARN
+        agent_arn = get_agent_arn_from_parameter_store(agent_name, self.region)
+        
+        # Direct bedrock-agentcore call
+        client = get_agentcore_client(self.region)
+        payload_dict = {'prompt': query}
+        payload_bytes = json.dumps(payload_dict).encode('utf-8')
+        
+        response = client.invoke_agent_runtime(
+            agentRuntimeArn=agent_arn,
+            payload=payload_bytes
+        )
+        
+        # Handle response
+        result = ""
+        if 'response' in response:
+            response_body = response['response']
+            if hasattr(response_body, 'read'):
+                result = response_body.read().decode('utf-8')
+            else:
+                result = str(response_body)
+        return result
+    
     async def fallback_direct_call(self, agent_name: str, query: str) -> Dict[str, Any]:
         """Fallback to direct bedrock-agentcore call when MCP fails"""
         try:
             logger.warning(f"🔄 Falling back to direct call for {agent_name}")
             
-            # Get agent ARN
-            ssm_client = boto3.client('ssm', region_name=self.region)
-            response = ssm_client.get_parameter(Name=f'/agents/{agent_name}_arn')
-            agent_arn = response['Parameter']['Value']
-            
-            # Direct bedrock-agentcore call
-            client = boto3.client('bedrock-agentcore', region_name=self.region)
-            payload_dict = {'prompt': query}
-            payload_bytes = json.dumps(payload_dict).encode('utf-8')
-            
-            response = client.invoke_agent_runtime(
-                agentRuntimeArn=agent_arn,
-                payload=payload_bytes
-            )
-            
-            # Handle response
-            result = ""
-            if 'response' in response:
-                response_body = response['response']
-                if hasattr(response_body, 'read'):
-                    result = response_body.read().decode('utf-8')
-                else:
-                    result = str(response_body)
+            # boto3 is blocking, so run the call in a worker thread to keep other agent
+            # calls on the event loop moving
+            result = await asyncio.to_thread(self._invoke_agent_direct, agent_name, query)
             
             # Try to parse as JSON
             try:
@@ -146,7 +283,8 @@ class TrueMCPOrchestrator:
             logger.error(f"Direct call fallback failed: {e}")
             return {"error": f"Both MCP and direct calls failed: {str(e)}", "mcp_protocol_used": False}
     
-    async def analyze_kitchen_via_mcp(self, query: str, image_path: str = None) -> Dict[str, Any]:
+    async def analyze_kitchen_via_mcp(self, query: str, image_path: str = None,
+                                      mcp_url: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Analyze kitchen using LangGraph agent via MCP"""
         logger.info("🏠 Starting kitchen analysis via MCP...")
         
@@ -155,7 +293,7 @@ class TrueMCPOrchestrator:
             "image_path": image_path
         }
         
-        result = await self.invoke_agent_via_mcp("langgraph_agent", "analyze_kitchen", arguments)
+        result = await self.invoke_agent_via_mcp("langgraph_agent", "analyze_kitchen", arguments, mcp_url, headers)
         
         # Ensure result is a dictionary
         if isinstance(result, str):
@@ -168,7 +306,8 @@ class TrueMCPOrchestrator:
         
         return result
     
-    async def estimate_costs_via_mcp(self, materials_data: List[Dict], cost_grade: str = "standard") -> Dict[str, Any]:
+    async def estimate_costs_via_mcp(self, materials_data: List[Dict], cost_grade: str = "standard",
+                                     mcp_url: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Estimate costs using CrewAI agent via MCP"""
         logger.info("💰 Starting cost estimation via MCP...")
         
@@ -178,7 +317,7 @@ class TrueMCPOrchestrator:
             "cost_grade": cost_grade
         }
         
-        result = await self.invoke_agent_via_mcp("crewai_agent", "estimate_costs", arguments)
+        result = await self.invoke_agent_via_mcp("crewai_agent", "estimate_costs", arguments, mcp_url, headers)
         
         # Ensure result is a dictionary
         if isinstance(result, str):
@@ -191,28 +330,55 @@ class TrueMCPOrchestrator:
         
         return result
     
+    def run_full_renovation_analysis(self, query: str, cost_grade: str = "standard", image_path: str = None) -> Dict[str, Any]:
+        """
+        Blocking version of full_renovation_analysis for synchronous callers
+        
+        Runs on the shared background loop rather than a fresh asyncio.run() loop, so
+        calls from several threads overlap and reuse the orchestrator's pooled sessions.
+        Release the sessions with run_async(orchestrator.close()) when done.
+        """
+        return run_async(self.full_renovation_analysis(query, cost_grade, image_path))
+    
     async def full_renovation_analysis(self, query: str, cost_grade: str = "standard", image_path: str = None) -> Dict[str, Any]:
         """Complete renovation analysis using MCP agent-to-agent communication"""
         logger.info("🎯 Starting full MCP agent-to-agent renovation analysis...")
         
+        cost_task = None
         try:
+            # Both agents' URLs and the auth headers are independent lookups, so resolve them together.
+            # A failed lookup is left as None so that call retries it and falls back to a direct call.
+            setup = await asyncio.gather(
+                self.get_agent_mcp_url("langgraph_agent"),
+                self.get_agent_mcp_url("crewai_agent"),
+                self.get_auth_headers(),
+                return_exceptions=True
+            )
+            langgraph_url, crewai_url, headers = (None if isinstance(value, Exception) else value for value in setup)
+            
+            # The LangGraph MCP tool reports materials, but its direct-call fallback returns
+            # plain text, which leaves the defaults. When LangGraph can't be reached over MCP
+            # the defaults are all but certain, so only then start costing them alongside the
+            # analysis (a direct call runs in a worker thread that cancel() can't stop)
+            default_materials = list(DEFAULT_MATERIALS)
+            if not MCP_AVAILABLE or langgraph_url is None:
+                cost_task = asyncio.create_task(
+                    self.estimate_costs_via_mcp(default_materials, cost_grade, crewai_url, headers)
+                )
+            
             # Step 1: Kitchen Analysis via MCP
-            analysis_result = await self.analyze_kitchen_via_mcp(query, image_path)
+            analysis_result = await self.analyze_kitchen_via_mcp(query, image_path, langgraph_url, headers)
             
             # Step 2: Extract materials for cost estimation  
-            materials_data = []
-            if "materials" in analysis_result:
-                materials_data = analysis_result["materials"]
-            else:
-                # Default materials if analysis doesn't provide them
-                materials_data = [
-                    {"material_type": "wood", "area_sqm": 14.0, "location": "cabinet"},
-                    {"material_type": "granite", "area_sqm": 7.5, "location": "countertop"},
-                    {"material_type": "tile", "area_sqm": 18.5, "location": "flooring"}
-                ]
+            materials_data = analysis_result.get("materials") or default_materials
             
-            # Step 3: Cost Estimation via MCP
-            cost_result = await self.estimate_costs_via_mcp(materials_data, cost_grade)
+            # Step 3: Cost Estimation via MCP, reusing the speculative call if its materials match
+            if cost_task is not None and materials_data == default_materials:
+                cost_result = await cost_task
+            else:
+                if cost_task is not None:
+                    cost_task.cancel()
+                cost_result = await self.estimate_costs_via_mcp(materials_data, cost_grade, crewai_url, headers)
             
             # Step 4: Combine results
             final_result = {
@@ -241,6 +407,8 @@ class TrueMCPOrchestrator:
             return final_result
             
         except Exception as e:
+            if cost_task is not None:
+                cost_task.cancel()
             logger.error(f"Full MCP analysis failed: {e}")
             return {
                 "error": f"MCP agent-to-agent analysis failed: {str(e)}",
@@ -258,8 +426,6 @@ async def test_true_mcp_communication():
         # Try to import again after user installs
         return
     
-    orchestrator = TrueMCPOrchestrator()
-    
     test_query = """I have a kitchen with a refrigerator and oven that I want to renovate. 
     Please analyze the layout and provide cost estimates for materials and labor for a standard Australian kitchen renovation."""
     
@@ -267,10 +433,11 @@ async def test_true_mcp_communication():
     print()
     
     try:
-        result = await orchestrator.full_renovation_analysis(
-            query=test_query,
-            cost_grade="standard"
-        )
+        async with TrueMCPOrchestrator() as orchestrator:
+            result = await orchestrator.full_renovation_analysis(
+                query=test_query,
+                cost_grade="standard"
+            )
         
         print("📋 MCP Communication Results:")
         print("=" * 40)
@@ -3,13 +3,13 @@
 Update existing IAM role with ECR permissions
 """
 
-import boto3
 import json
+from utils import get_boto3_client
 
 
 def update_role_permissions():
     """Update the existing IAM role with ECR permissions"""
-    iam_client = boto3.client('iam')
+    iam_client = get_boto3_client('iam')
     role_name = "AgentCore-langgraph_agent-Role"
     
     # Updated permissions policy with ECR access
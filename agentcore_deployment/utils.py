@@ -1,18 +1,59 @@
 """
 Utility functions for AgentCore deployment
 """
+import base64
 import boto3
 from botocore.config import Config
 import json
+import mmap
+import os
+import threading
 import time
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+# Default config for shared clients. Keep-alive connections are reused between
+# calls instead of re-doing the TCP and TLS handshake every time, and
+# botocore's default pool of 10 connections would make concurrent calls
+# beyond that wait for a free connection.
+SHARED_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    connect_timeout=5,
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
+# boto3 clients created in this process, keyed by (service, region). Building a
+# client loads its service model, so each one is created once and shared.
+_CLIENTS: Dict[Tuple[str, Optional[str]], Any] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_boto3_client(service: str, region: Optional[str] = None, config: Optional[Config] = None):
+    """
+    Return the shared boto3 client for a service and region, creating it on first use
+    
+    The config (SHARED_CLIENT_CONFIG unless given) only applies when the
+    client is first created.
+    """
+    key = (service, region)
+    client = _CLIENTS.get(key)
+    if client is None:
+        # boto3's default session isn't safe to build clients from concurrently
+        with _CLIENT_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                client = _CLIENTS[key] = boto3.client(service, region_name=region,
+                                                       config=config or SHARED_CLIENT_CONFIG)
+    return client
 
 
 def create_agentcore_role(agent_name: str, region: str) -> Dict[str, Any]:
     """
     Create IAM role for AgentCore agent
     """
-    iam_client = boto3.client('iam', region_name=region)
+    iam_client = get_boto3_client('iam', region)
     
     # Trust policy for AgentCore
     trust_policy = {
@@ -92,7 +133,7 @@ def update_orchestrator_permissions(sub_agent_arns: list, sub_agent_parameter_ar
     """
     Update orchestrator role with permissions to invoke sub-agents
     """
-    iam_client = boto3.client('iam')
+    iam_client = get_boto3_client('iam')
     
     orchestrator_permissions = {
         "Version": "2012-10-17",
@@ -130,7 +171,7 @@ def save_agent_arn_to_parameter_store(agent_name: str, agent_arn: str):
     """
     Save agent ARN to Parameter Store for lookup
     """
-    ssm = boto3.client('ssm')
+    ssm = get_ssm_client()
     try:
         ssm.put_parameter(
             Name=f'/agents/{agent_name}_arn',
@@ -138,31 +179,97 @@ def save_agent_arn_to_parameter_store(agent_name: str, agent_arn: str):
             Type='String',
             Overwrite=True
         )
+        # A redeploy changes the ARN, so don't keep serving the old one from the cache
+        _ARN_CACHE[(agent_name, None)] = (time.monotonic(), agent_arn)
         print(f"✅ Saved {agent_name} ARN to Parameter Store")
     except Exception as e:
         print(f"❌ Failed to save {agent_name} ARN: {e}")
         raise
 
 
-def get_agent_arn_from_parameter_store(agent_name: str) -> str:
+def get_ssm_client(region: Optional[str] = None):
+    """
+    Return the shared SSM client for a region (the default region when not given)
+    """
+    return get_boto3_client('ssm', region)
+
+
+# Agent ARNs looked up in this process, keyed by (agent name, region) -> (fetched_at, arn)
+# with fetched_at from time.monotonic(). Entries expire so a redeployed agent is
+# picked up without restarting.
+ARN_CACHE_TTL = 300
+_ARN_CACHE: Dict[Tuple[str, Optional[str]], tuple] = {}
+
+
+def get_agent_arn_from_parameter_store(agent_name: str, region: Optional[str] = None) -> str:
     """
     Retrieve agent ARN from Parameter Store
+    
+    Lookups are cached for ARN_CACHE_TTL seconds.
     """
-    ssm = boto3.client('ssm')
+    cached = _ARN_CACHE.get((agent_name, region))
+    if cached and time.monotonic() - cached[0] < ARN_CACHE_TTL:
+        return cached[1]
+    
+    ssm = get_ssm_client(region)
     try:
         response = ssm.get_parameter(Name=f'/agents/{agent_name}_arn')
-        return response['Parameter']['Value']
+        agent_arn = response['Parameter']['Value']
+        _ARN_CACHE[(agent_name, region)] = (time.monotonic(), agent_arn)
+        return agent_arn
     except Exception as e:
         print(f"❌ Failed to get {agent_name} ARN: {e}")
         raise
 
 
-def invoke_agent_with_boto3(agent_arn: str, user_query: str) -> str:
+def get_agent_arns_from_parameter_store(agent_names: List[str]) -> Dict[str, str]:
+    """
+    Retrieve several agent ARNs from Parameter Store in a single GetParameters call
+
+    Agents whose parameter is missing are left out of the returned dict.
+    """
+    ssm = get_ssm_client()
+    try:
+        # GetParameters accepts up to 10 names per request
+        response = ssm.get_parameters(Names=[f'/agents/{name}_arn' for name in agent_names])
+        arns = {}
+        fetched_at = time.monotonic()
+        for parameter in response['Parameters']:
+            agent_name = parameter['Name'][len('/agents/'):-len('_arn')]
+            arns[agent_name] = parameter['Value']
+            _ARN_CACHE[(agent_name, None)] = (fetched_at, parameter['Value'])
+        for missing in response.get('InvalidParameters', []):
+            print(f"❌ Parameter not found: {missing}")
+        return arns
+    except Exception as e:
+        print(f"❌ Failed to get agent ARNs {agent_names}: {e}")
+        raise
+
+
+# Agent invocations can run for minutes and are fanned out concurrently, so
+# they get a longer read timeout and a bigger pool on top of the shared config
+AGENTCORE_CLIENT_CONFIG = SHARED_CLIENT_CONFIG.merge(Config(
+    connect_timeout=3,
+    read_timeout=180,
+    max_pool_connections=64,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+))
+
+def get_agentcore_client(region: str = 'us-west-2'):
+    """
+    Return the shared bedrock-agentcore client for a region
+    """
+    return get_boto3_client('bedrock-agentcore', region, config=AGENTCORE_CLIENT_CONFIG)
+
+
+def invoke_agent_with_boto3(agent_arn: str, user_query: str, client=None) -> str:
     """
     Invoke an AgentCore agent using boto3
+
+    Uses the shared module-level client unless another client is passed in.
     """
-    client = boto3.client('bedrock-agentcore', region_name='us-west-2', 
-                          config=Config(read_timeout=180, retries={'max_attempts': 5, 'mode': 'adaptive'}))
+    if client is None:
+        client = get_agentcore_client()
     
     try:
         import json
@@ -191,3 +298,57 @@ def invoke_agent_with_boto3(agent_arn: str, user_query: str) -> str:
     except Exception as e:
         print(f"❌ Failed to invoke agent {agent_arn}: {e}")
         return f"Error: {str(e)}"
+
+
+def invoke_agent_with_boto3_stream(agent_arn: str, user_query: str, client=None) -> Iterator[str]:
+    """
+    Invoke an AgentCore agent and yield its response line by line as it arrives
+
+    The lines are yielded undecoded from the wire format (SSE 'data: ' lines
+    for streaming agents), so joining them with newlines gives the same text
+    invoke_agent_with_boto3 returns.
+    """
+    if client is None:
+        client = get_agentcore_client()
+    
+    try:
+        payload_bytes = json.dumps({'prompt': user_query}).encode('utf-8')
+        
+        response = client.invoke_agent_runtime(
+            agentRuntimeArn=agent_arn,
+            payload=payload_bytes
+        )
+        
+        response_body = response.get('response')
+        if response_body is None:
+            return
+        if hasattr(response_body, 'iter_lines'):
+            for line in response_body.iter_lines():
+                yield line.decode('utf-8')
+        else:
+            yield str(response_body)
+        
+    except Exception as e:
+        print(f"❌ Failed to invoke agent {agent_arn}: {e}")
+        yield f"Error: {str(e)}"
+
+
+# S3 bucket for test kitchen images - when set, image_arguments uploads the image and
+# returns an s3:// URI instead of base64 bytes for the MCP payload
+KITCHEN_IMAGE_BUCKET = os.environ.get("KITCHEN_IMAGE_BUCKET")
+
+
+def image_arguments(image_path: str) -> Dict[str, str]:
+    """
+    Build the image argument for the orchestrator's renovation workflow tool
+
+    Returns image_s3_uri when KITCHEN_IMAGE_BUCKET is set, otherwise base64 image_data.
+    """
+    if KITCHEN_IMAGE_BUCKET:
+        key = f"kitchen-images/test/{Path(image_path).name}"
+        get_boto3_client('s3', 'us-west-2').upload_file(image_path, KITCHEN_IMAGE_BUCKET, key)
+        return {'image_s3_uri': f"s3://{KITCHEN_IMAGE_BUCKET}/{key}"}
+    # Encode straight from the page cache rather than reading the file into another bytes copy;
+    # base64 output is pure ASCII, so decode it as such
+    with open(image_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return {'image_data': base64.b64encode(mm).decode('ascii')}